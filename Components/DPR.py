@@ -3,6 +3,7 @@
 import torch
 import numpy as np
 import faiss
+from Components import metrics
 from transformers import (
     DPRQuestionEncoder,
     DPRContextEncoder,
@@ -32,9 +33,10 @@ def encode_passage(video_df):
             embedding = np.zeros(passage_encoder.config.hidden_size)
         else:
             # Tokenize and encode the passage
-            inputs = passage_tokenizer(passage, return_tensors='pt', max_length=512, truncation=True, padding=True)
-            with torch.no_grad():
-                embedding = passage_encoder(**inputs).pooler_output.numpy()
+            with metrics.span('dpr_encode_passage'):
+                inputs = passage_tokenizer(passage, return_tensors='pt', max_length=512, truncation=True, padding=True)
+                with torch.no_grad():
+                    embedding = passage_encoder(**inputs).pooler_output.numpy()
         passage_embeddings.append(embedding)
 
     # Convert to a Numpy Array
@@ -53,24 +55,35 @@ def faiss_vector_store(passage_embeddings):
     faiss.normalize_L2(passage_embeddings)
 
     # Add the passage embeddings to the index
-    faiss_index.add(passage_embeddings)
+    with metrics.span('faiss_build'):
+        faiss_index.add(passage_embeddings)
     return faiss_index
 
-def search_relevant_passages(video_df, query, faiss_index, top_k=3):
+def encode_query(query):
     """
-    Searches for the most relevant passages based on the query.
+    Encodes a query with the DPR Question encoder and L2-normalizes it.
     """
-    # Encode the query using the DPR Question encoder
     query_inputs = query_tokenizer(query, return_tensors='pt', max_length=128, truncation=True, padding=True)
 
-    with torch.no_grad():
-        query_embedding = query_encoder(**query_inputs).pooler_output.numpy()
+    with metrics.span('dpr_encode_query'), torch.no_grad():
+        query_embedding = query_encoder(**query_inputs).pooler_output.numpy().astype('float32')
 
     # Normalize the query embedding
     faiss.normalize_L2(query_embedding)
+    return query_embedding
+
+def search_relevant_passages(video_df, query, faiss_index, top_k=3, query_embedding=None):
+    """
+    Searches for the most relevant passages based on the query.
+    A precomputed embedding from encode_query can be passed to avoid encoding the query twice.
+    """
+    # Encode the query using the DPR Question encoder
+    if query_embedding is None:
+        query_embedding = encode_query(query)
 
     # Search for the top-k most similar passages
-    distances, indices = faiss_index.search(query_embedding.astype('float32'), top_k)
+    with metrics.span('faiss_search'):
+        distances, indices = faiss_index.search(query_embedding.astype('float32'), top_k)
 
     # Filter the DataFrame based on the retrieved indices
     top_k_indices = indices[0][:top_k]
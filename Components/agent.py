@@ -1,6 +1,6 @@
 # Components/agent.py
 
-import ollama
+from Components import llm
 from IPython.display import display, Markdown
 
 def generate_question(city):
@@ -12,11 +12,36 @@ def generate_question(city):
     Please provide only the questions, numbered 1 to 10, without any additional descriptions.
     """
     try:
-        response = ollama.chat(model="llama3.2", messages=[{'role':'user', 'content': prompt}])
-        return response['message']['content']
+        return llm.chat(prompt, model="llama3.2")
     except Exception as e:
         return f"Error generating questions: {e}"
 
+def generate_llm_response(query, context, LLM = "llama3.2"):
+    """
+    Answers a traveler's question using the retrieved video summaries as context.
+    """
+    prompt = f""" You are a knowledgeable and friendly travel guide assistant, ready to provide insightful recommendations and 
+                 answers based on the information given. Please consider the context carefully and answer 
+                 the question below with detailed and helpful information.
+
+                 ### Context:
+                 {context}
+
+                 ### Question:
+                 {query}
+
+                 ### Instructions for Your Answer:
+                 - Provide a comprehensive response, including tips or suggestions if applicable.
+                 - Use a friendly and conversational tone to engage the user.
+                 - Ensure your answer is clear, concise, and directly addresses the question.
+
+                 ### Answer:
+                 """
+    try:
+        return llm.chat(prompt, model=LLM)
+    except Exception as e:
+        return f"Error generating response: {e}"
+
 def display_question_with_markdown(city):
     """
     Displays the generated questions in a markdown format.
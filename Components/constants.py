@@ -1,4 +1,5 @@
 # Load Constants
+import os
 
 DESTINATION = "Amsterdam, Dubai, Hawaii"
 
@@ -90,3 +91,41 @@ LLM = "facebook/bart-large-cnn"
 LOCAL_LLM = "llama3.2"
 MAX_TOKENS = 1000
 MIN_DURATION = 10
+INDEX_CACHE_MAX_ENTRIES = 8  # Number of FAISS indexes kept in memory
+INDEX_CACHE_MAX_BYTES = 512 * 1024 * 1024  # 512 MB budget for cached indexes
+VIDEO_STORE_MAX_ENTRIES = 5000  # Video records shared across sessions
+VIDEO_STORE_MAX_BYTES = 256 * 1024 * 1024  # Budget for their transcript and summary text
+SEGMENT_STORE_MAX_ENTRIES = 5000  # Transcripts whose segment timings are kept for timestamped links
+SEGMENT_STORE_MAX_BYTES = 64 * 1024 * 1024  # Budget for their timing arrays
+RESULTS_PAGE_SIZE = 10  # Videos rendered per results page
+SUMMARY_PREVIEW_CHARS = 300  # Summary characters sent to the browser before "Show full text"
+SEMANTIC_CACHE_THRESHOLD = 0.95  # Cosine similarity above which a previous answer is reused
+SEMANTIC_CACHE_TTL = 24 * 60 * 60  # Seconds a cached answer stays valid
+SEMANTIC_CACHE_MAX_ENTRIES = 256  # Cached answers kept per index
+SEMANTIC_CACHE_MAX_INDEXES = 16  # Indexes with cached answers kept in memory
+QUESTION_BANK_PATH = "./assets/question_bank.json"  # Precomputed questions (and answers) per destination
+OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://127.0.0.1:11434")  # Point at a stub server for tests
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")  # Keep the model loaded between requests
+OLLAMA_MAX_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2"))  # Generations sent to Ollama at once
+OLLAMA_QUEUE_TIMEOUT = 300  # Seconds a request may wait for a free generation slot
+OLLAMA_REQUEST_TIMEOUT = 600  # Seconds before a single generation is abandoned
+METRICS_ENABLED = os.getenv("TRAVEL_AGENT_METRICS", "0") == "1"  # Per-stage timing spans and counters
+METRICS_DIR = os.getenv("TRAVEL_AGENT_METRICS_DIR", "./metrics")  # events.jsonl and metrics.prom are written here
+PROFILER = os.getenv("TRAVEL_AGENT_PROFILER", "")  # "cprofile" or "py-spy" to profile single requests
+CORPUS_DIR = os.getenv("TRAVEL_AGENT_CORPUS_DIR", "./corpora")  # Precomputed destination corpora written by batch.py
+SEARCH_CACHE_TTL = 60 * 60  # Seconds raw YouTube search results are reused for re-filtering
+EXPORT_CHUNK_ROWS = 200  # Rows serialized per chunk when exporting large transcript tables
+EXPORT_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Budget for cached export buffers
+DEDUP_THRESHOLD = 0.6  # Estimated transcript Jaccard similarity above which videos count as near-duplicates
+DEDUP_NUM_PERM = 128  # MinHash permutations per transcript
+DEDUP_BANDS = 32  # LSH bands (DEDUP_NUM_PERM / DEDUP_BANDS rows per band)
+DEDUP_SHINGLE_WORDS = 5  # Words per transcript shingle
+
+# Summarization profiles: model checkpoint and decoding settings, from fastest to best quality
+DISTILLED_LLM = "sshleifer/distilbart-cnn-12-6"
+SUMMARY_PROFILES = {
+    "fast": {"model": DISTILLED_LLM, "num_beams": 1, "max_length": 80, "min_length": 20},
+    "balanced": {"model": DISTILLED_LLM, "num_beams": 2, "max_length": 120, "min_length": 30},
+    "quality": {"model": LLM, "num_beams": 4, "max_length": 140, "min_length": 30},
+}
+DEFAULT_SUMMARY_PROFILE = "quality"
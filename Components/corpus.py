@@ -0,0 +1,79 @@
+# Components/corpus.py
+
+import os
+import re
+import json
+import pandas as pd
+import faiss
+from Components.constants import *
+from Components.segments import SEGMENTS
+
+# Pipeline stages in order; each one leaves a checkpoint file in the destination's corpus directory
+STAGES = ['videos', 'transcripts', 'summaries', 'index']
+STAGE_FILES = {
+    'videos': 'videos.csv',
+    'transcripts': 'transcripts.csv',
+    'summaries': 'summaries.csv',
+    'index': 'index.faiss',
+}
+SEGMENTS_FILE = 'segments.npz'  # Transcript segment timings, written with the transcripts stage
+
+def destination_slug(destination):
+    """
+    Converts a destination name into a directory name: "New York" -> "new-york".
+    """
+    return re.sub(r'[^a-z0-9]+', '-', destination.strip().lower()).strip('-')
+
+def corpus_dir(destination, root=CORPUS_DIR):
+    return os.path.join(root, destination_slug(destination))
+
+def stage_path(destination, stage, root=CORPUS_DIR):
+    return os.path.join(corpus_dir(destination, root), STAGE_FILES[stage])
+
+def has_stage(destination, stage, root=CORPUS_DIR):
+    return os.path.exists(stage_path(destination, stage, root))
+
+def save_stage(destination, stage, data, root=CORPUS_DIR):
+    """
+    Writes a stage checkpoint atomically: a DataFrame as CSV, or a FAISS index.
+    """
+    path = stage_path(destination, stage, root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if stage == 'index':
+        faiss.write_index(data, tmp_path)
+    else:
+        data.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def load_stage(destination, stage, root=CORPUS_DIR):
+    path = stage_path(destination, stage, root)
+    if stage == 'index':
+        return faiss.read_index(path)
+    return pd.read_csv(path, keep_default_na=False)
+
+def save_manifest(destination, manifest, root=CORPUS_DIR):
+    path = os.path.join(corpus_dir(destination, root), 'manifest.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+def load_manifest(destination, root=CORPUS_DIR):
+    path = os.path.join(corpus_dir(destination, root), 'manifest.json')
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_corpus(destination, root=CORPUS_DIR):
+    """
+    Loads a finished corpus (summarized videos and their FAISS index) for the app.
+    Returns (videos_df, faiss_index), or (None, None) if the destination has not been precomputed.
+    """
+    if not (has_stage(destination, 'summaries', root) and has_stage(destination, 'index', root)):
+        return None, None
+
+    # Segment timings let chat answers link to the right moment in each video
+    segments_path = os.path.join(corpus_dir(destination, root), SEGMENTS_FILE)
+    if os.path.exists(segments_path):
+        SEGMENTS.load(segments_path)
+    return load_stage(destination, 'summaries', root), load_stage(destination, 'index', root)
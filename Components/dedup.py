@@ -0,0 +1,130 @@
+# Components/dedup.py
+
+import math
+import zlib
+import numpy as np
+from collections import defaultdict
+from Components import metrics
+from Components.constants import *
+
+def _permutations(num_perm=DEDUP_NUM_PERM, seed=42):
+    # Multiply-shift hash family: h_i(x) = ((a_i * x + b_i) mod 2^64) >> 32, with odd a_i
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+    return a, b
+
+_A, _B = _permutations()
+
+def is_valid_transcript(transcript):
+    return bool(transcript) and not str(transcript).startswith(
+        ("No transcript", "Error", "Invalid", "Transcripts are disabled")
+    )
+
+def shingle_hashes(text, k=DEDUP_SHINGLE_WORDS):
+    """
+    Hashes every k-word shingle of the text to a 32-bit integer.
+    """
+    words = str(text).lower().split()
+    if len(words) < k:
+        words = words + [''] * (k - len(words))
+    shingles = {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+    return np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+def minhash_signature(text):
+    """
+    Computes the MinHash signature (DEDUP_NUM_PERM values) of a transcript.
+    """
+    hashes = shingle_hashes(text)
+    # (num_perm, num_shingles) matrix; uint64 arithmetic wraps, which is the mod 2^64 we want
+    with np.errstate(over='ignore'):
+        permuted = (np.outer(_A, hashes) + _B[:, None]) >> np.uint64(32)
+    return permuted.min(axis=1)
+
+def find_duplicate_clusters(transcripts, threshold=DEDUP_THRESHOLD, bands=DEDUP_BANDS):
+    """
+    Groups near-duplicate transcripts with MinHash + LSH banding.
+    Only pairs sharing a band bucket are compared, so the work stays near-linear in the number of transcripts.
+
+    Returns:
+    - clusters (list): Lists of positions (into `transcripts`) with more than one member.
+    """
+    positions = [i for i, t in enumerate(transcripts) if is_valid_transcript(t)]
+    if len(positions) < 2:
+        return []
+
+    signatures = np.vstack([minhash_signature(transcripts[i]) for i in positions])
+    rows = signatures.shape[1] // bands
+
+    # Candidate pairs: signatures identical in at least one band
+    candidates = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        band_values = signatures[:, band * rows:(band + 1) * rows]
+        for idx, key in enumerate(map(bytes, band_values)):
+            buckets[key].append(idx)
+        for members in buckets.values():
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    candidates.add((members[i], members[j]))
+
+    # Verify candidates with the estimated Jaccard similarity and union them
+    parent = list(range(len(positions)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in candidates:
+        if np.mean(signatures[i] == signatures[j]) >= threshold:
+            parent[find(i)] = find(j)
+
+    groups = defaultdict(list)
+    for idx in range(len(positions)):
+        groups[find(idx)].append(positions[idx])
+    return [sorted(group) for group in groups.values() if len(group) > 1]
+
+def deduplicate_videos(videos_df, threshold=DEDUP_THRESHOLD):
+    """
+    Collapses each cluster of near-duplicate transcripts to one representative video
+    (the most viewed, else the longest transcript) before summarization and indexing.
+
+    Returns:
+    - videos_df (DataFrame): The videos with duplicates removed.
+    - report (dict): Clusters found and the model compute skipped.
+    """
+    transcripts = videos_df['Transcript'].tolist()
+    with metrics.span('dedup'):
+        clusters = find_duplicate_clusters(transcripts, threshold)
+
+    drop = []
+    duplicates = []
+    for cluster in clusters:
+        if 'Views' in videos_df.columns:
+            keep = max(cluster, key=lambda i: (videos_df['Views'].iloc[i], len(transcripts[i])))
+        else:
+            keep = max(cluster, key=lambda i: len(transcripts[i]))
+        dropped = [i for i in cluster if i != keep]
+        drop.extend(dropped)
+        duplicates.append({
+            'kept': videos_df['Title'].iloc[keep],
+            'dropped': [videos_df['Title'].iloc[i] for i in dropped],
+        })
+
+    # BART runs once per MAX_TOKENS chunk (about 1.3 tokens per word) and DPR once per video
+    words_skipped = sum(len(str(transcripts[i]).split()) for i in drop)
+    bart_chunks_skipped = sum(math.ceil(len(str(transcripts[i]).split()) * 1.3 / MAX_TOKENS) for i in drop)
+    report = {
+        'videos': len(transcripts),
+        'clusters': duplicates,
+        'videos_dropped': len(drop),
+        'transcript_words_skipped': words_skipped,
+        'bart_chunks_skipped': bart_chunks_skipped,
+        'dpr_passages_skipped': len(drop),
+    }
+    metrics.incr('dedup_videos_dropped', len(drop))
+
+    deduped_df = videos_df.drop(videos_df.index[drop]).reset_index(drop=True)
+    return deduped_df, report
@@ -0,0 +1,110 @@
+# Components/export.py
+
+import io
+import hashlib
+import pandas as pd
+from docx import Document
+from Components.constants import *
+from Components.lru import BoundedLRU
+
+MIME_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'txt': 'text/plain',
+}
+
+_cache = BoundedLRU(max_bytes=EXPORT_CACHE_MAX_BYTES)  # (format, content hash) -> bytes
+
+def parquet_available():
+    """
+    Parquet export needs pyarrow or fastparquet, which are optional.
+    """
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        try:
+            import fastparquet  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+def content_hash(content):
+    """
+    Hashes a DataFrame (vectorized, per-row hashes) or a string.
+    """
+    if isinstance(content, pd.DataFrame):
+        row_hashes = pd.util.hash_pandas_object(content, index=False).values
+        digest = hashlib.sha1(row_hashes.tobytes())
+        digest.update('|'.join(map(str, content.columns)).encode('utf-8'))
+        return digest.hexdigest()
+    return hashlib.sha1(str(content).encode('utf-8')).hexdigest()
+
+def _chunks(videos_df, chunk_rows=EXPORT_CHUNK_ROWS):
+    for start in range(0, len(videos_df), chunk_rows):
+        yield start, videos_df.iloc[start:start + chunk_rows]
+
+def videos_to_csv(videos_df):
+    buffer = io.BytesIO()
+    # Chunks are encoded straight into the byte buffer, with no intermediate str of the table
+    for start, chunk in _chunks(videos_df):
+        chunk.to_csv(buffer, index=False, header=(start == 0), encoding='utf-8')
+    return buffer.getvalue()
+
+def videos_to_jsonl(videos_df):
+    buffer = io.BytesIO()
+    # Only one chunk's JSON text exists at a time
+    for _, chunk in _chunks(videos_df):
+        text = chunk.to_json(orient='records', lines=True, force_ascii=False)
+        buffer.write(text.encode('utf-8'))
+        if text and not text.endswith('\n'):
+            buffer.write(b'\n')
+    return buffer.getvalue()
+
+def videos_to_parquet(videos_df):
+    if not parquet_available():
+        raise ImportError("Parquet export requires pyarrow: pip install pyarrow")
+    buffer = io.BytesIO()
+    videos_df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+def itinerary_to_docx(itinerary):
+    """
+    Builds the itinerary DOCX in memory.
+    """
+    doc = Document()
+    doc.add_heading('Travel Itinerary', level=1)
+
+    # Split the itinerary into lines and add to the document
+    for line in itinerary.split('\n'):
+        if line.strip():  # Avoid empty lines
+            doc.add_paragraph(line.strip())
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+def itinerary_to_txt(itinerary):
+    return itinerary.encode('utf-8')
+
+BUILDERS = {
+    'csv': videos_to_csv,
+    'jsonl': videos_to_jsonl,
+    'parquet': videos_to_parquet,
+    'docx': itinerary_to_docx,
+    'txt': itinerary_to_txt,
+}
+
+def export(content, fmt):
+    """
+    Returns the export of a videos DataFrame (csv, jsonl, parquet) or an itinerary string (docx, txt) as bytes.
+    Buffers are cached by content hash, so unchanged content is never serialized twice.
+    """
+    key = (fmt, content_hash(content))
+    data = _cache.get(key)
+    if data is None:
+        data = BUILDERS[fmt](content)
+        _cache.put(key, data, len(data))
+    return data
@@ -0,0 +1,83 @@
+# Components/index_cache.py
+
+import hashlib
+import threading
+from Components import metrics
+from Components.constants import *
+from Components.lru import BoundedLRU
+from Components.transcript import extract_video_id, hash_transcript
+
+def index_fingerprint(videos_df):
+    """
+    Builds a cheap content fingerprint for a videos DataFrame.
+    Uses the sorted video IDs and the transcript hashes computed by extract_transcripts,
+    so the transcript text itself is never rehashed on a rerun.
+    """
+    if 'TranscriptHash' in videos_df.columns:
+        transcript_hashes = videos_df['TranscriptHash'].tolist()
+    else:
+        transcript_hashes = [hash_transcript(t) for t in videos_df['Transcript'].tolist()]
+
+    video_ids = [extract_video_id(link) or link for link in videos_df['Link'].tolist()]
+    pairs = sorted(zip(video_ids, transcript_hashes))
+    # Row order matters to the index (search results map back via iloc)
+    order = "|".join(video_ids)
+    payload = order + "#" + "|".join(f"{vid}:{h}" for vid, h in pairs)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def index_nbytes(faiss_index):
+    """
+    Estimates the memory held by a flat FAISS index (float32 vectors).
+    """
+    return int(faiss_index.ntotal) * int(faiss_index.d) * 4
+
+class IndexCache:
+    """
+    Bounded LRU cache of built FAISS indexes keyed by content fingerprint.
+    Evicts least recently used entries once either the entry count or the byte budget is exceeded.
+    on_evict, if given, is called with the fingerprint of every evicted index.
+    """
+
+    def __init__(self, max_entries=INDEX_CACHE_MAX_ENTRIES, max_bytes=INDEX_CACHE_MAX_BYTES, on_evict=None):
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self._entries = BoundedLRU(max_entries, max_bytes, on_evict=self._evicted)
+        self._lock = threading.Lock()  # Guards the hit/miss counters
+
+    def _evicted(self, fingerprint, faiss_index):
+        if self.on_evict is not None:
+            self.on_evict(fingerprint)
+
+    def get(self, fingerprint):
+        faiss_index = self._entries.get(fingerprint)
+        with self._lock:
+            if faiss_index is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        metrics.incr('index_cache', result='miss' if faiss_index is None else 'hit')
+        return faiss_index
+
+    def put(self, fingerprint, faiss_index):
+        self._entries.put(fingerprint, faiss_index, index_nbytes(faiss_index))
+
+    def get_or_build(self, fingerprint, build_fn):
+        """
+        Returns the cached index for the fingerprint, building and caching it with build_fn() on a miss.
+        """
+        faiss_index = self.get(fingerprint)
+        if faiss_index is None:
+            faiss_index = build_fn()
+            if faiss_index is not None:
+                self.put(fingerprint, faiss_index)
+        return faiss_index
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._entries.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -1,36 +1,81 @@
-import ollama
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from Components import llm
+from Components.constants import *
 from IPython.display import display, Markdown
-from docx import Document
+from Components.export import itinerary_to_docx
 
 
-def generate_itinerary(videos_df, duration, budget, travel_style):
+def allocate_days(summaries, num_days):
     """
-    Generates a detailed itinerary based on summarized content from videos.
+    Deterministically spreads the video summaries over the trip days.
+    Longest summaries are placed first, each on the day with the least content so far.
+    When there are more days than summaries, the summaries are reused so every day has material.
+    """
+    days = [[] for _ in range(num_days)]
+    if not summaries:
+        return days
+
+    loads = [0] * num_days
+    for summary in sorted(summaries, key=len, reverse=True):
+        day = loads.index(min(loads))
+        days[day].append(summary)
+        loads[day] += len(summary)
+
+    for day in range(len(summaries), num_days):
+        days[day].append(summaries[day % len(summaries)])
+    return days
+
+def generate_day_plan(day, num_days, day_summaries, budget, travel_style):
+    """
+    Generates the detailed plan for a single day of the trip.
     """
-    # Prepare the input for the model
-    summaries = videos_df['Summary'].tolist()
-    num_days = duration  # Assuming duration is an integer representing the number of days
-    
-    # Create a prompt for generating the itinerary
     prompt = f"""
-    As a travel guide expert, generate a detailed day-by-day itinerary for a traveler based on the following summaries:
-    {summaries}
-    
-    The trip lasts for {num_days} days, and the travel style is {travel_style}. 
-    Please include budget considerations of {budget} and make sure the activities are evenly distributed across the days.
-    
-    Format the itinerary with the day number and a list of activities for each day.
-    """
-    
+    As a travel guide expert, plan Day {day} of a {num_days}-day trip based on the following summaries:
+    {day_summaries}
+
+    The travel style is {travel_style}. Please include budget considerations of {budget}.
+    Only plan this one day: a morning, afternoon and evening list of activities drawn from the summaries.
+
+    Start with the heading "Day {day}" and format the activities as a list.
+    """
     try:
-        # Get response from the model
-        response = ollama.chat(model="llama3.2", messages=[{'role':'user', 'content': prompt}])
-        itinerary_md = response['message']['content']
-        
+        return llm.chat(prompt, model="llama3.2")
     except Exception as e:
-        return f"Error generating itinerary: {e}"
-    
-    return itinerary_md
+        return f"Day {day}\n\nError generating this day: {e}"
+
+def generate_itinerary(videos_df, duration, budget, travel_style, on_day=None):
+    """
+    Generates a detailed itinerary based on summarized content from videos.
+    Each day is generated in its own concurrent LLM request (bounded by the LLM gateway),
+    so wall time follows the longest day rather than the trip length.
+
+    Parameters:
+    - on_day (callable): Optional callback on_day(day, plan) called as each day completes, for streaming.
+    """
+    # Prepare the input for the model, skipping videos without a usable summary
+    summaries = [
+        summary for summary in videos_df['Summary'].tolist()
+        if summary and not str(summary).startswith(("No transcript", "Error", "No summarizable"))
+    ]
+    num_days = int(duration)  # Assuming duration is an integer representing the number of days
+    day_summaries = allocate_days(summaries, num_days)
+
+    plans = [None] * num_days
+    with ThreadPoolExecutor(max_workers=max(1, min(num_days, OLLAMA_MAX_CONCURRENCY * 2))) as executor:
+        futures = {
+            executor.submit(generate_day_plan, day + 1, num_days, day_summaries[day], budget, travel_style): day
+            for day in range(num_days)
+        }
+        for future in as_completed(futures):
+            day = futures[future]
+            plans[day] = future.result()
+            if on_day is not None:
+                on_day(day + 1, plans[day])
+
+    if all(plan.startswith(f"Day {day + 1}\n\nError") for day, plan in enumerate(plans)):
+        return f"Error generating itinerary: {plans[0].split('Error generating this day: ', 1)[-1]}"
+
+    return "\n\n".join(plans)
 
 def display_itinerary_with_markdown(videos_df, duration, budget, travel_style):
     """
@@ -44,12 +89,5 @@ def save_itinerary_to_doc(itinerary, filename='itinerary.docx'):
     """
     Saves the generated itinerary to a DOC file.
     """
-    doc = Document()
-    doc.add_heading('Travel Itinerary', level=1)
-
-    # Split the itinerary into lines and add to the document
-    for line in itinerary.split('\n'):
-        if line.strip():  # Avoid empty lines
-            doc.add_paragraph(line.strip())
-
-    doc.save(filename)
+    with open(filename, 'wb') as doc_file:
+        doc_file.write(itinerary_to_docx(itinerary))
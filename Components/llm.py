@@ -0,0 +1,106 @@
+# Components/llm.py
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future
+import ollama
+from Components import metrics
+from Components.constants import *
+
+# One pooled HTTP client for every module; the host can point at a local stub server
+_client = ollama.Client(host=OLLAMA_HOST, timeout=OLLAMA_REQUEST_TIMEOUT)
+
+# Bounds the generations sent to Ollama at once; further callers queue here
+_slots = threading.BoundedSemaphore(OLLAMA_MAX_CONCURRENCY)
+
+# Identical prompts already being generated -> Future shared by every waiting caller
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+# Recent per-call latency breakdowns, newest last
+_metrics = deque(maxlen=500)
+_metrics_lock = threading.Lock()
+
+def _seconds(response, field):
+    # Ollama reports durations in nanoseconds
+    value = response.get(field) if hasattr(response, 'get') else getattr(response, field, None)
+    return (value or 0) / 1e9
+
+def _generate(model, prompt, options):
+    queued_at = time.perf_counter()
+    if not _slots.acquire(timeout=OLLAMA_QUEUE_TIMEOUT):
+        raise TimeoutError(f"No free Ollama slot after {OLLAMA_QUEUE_TIMEOUT}s")
+    try:
+        started_at = time.perf_counter()
+        with metrics.span('ollama', model=model):
+            response = _client.chat(
+                model=model,
+                messages=[{'role': 'user', 'content': prompt}],
+                options=options,
+                keep_alive=OLLAMA_KEEP_ALIVE,
+            )
+        finished_at = time.perf_counter()
+    finally:
+        _slots.release()
+
+    record = {
+        'model': model,
+        'queue_wait': started_at - queued_at,
+        'total': finished_at - started_at,
+        'load': _seconds(response, 'load_duration'),
+        'prefill': _seconds(response, 'prompt_eval_duration'),
+        'generation': _seconds(response, 'eval_duration'),
+        'tokens_in': response.get('prompt_eval_count') or 0,
+        'tokens_out': response.get('eval_count') or 0,
+    }
+    with _metrics_lock:
+        _metrics.append(record)
+    metrics.incr('ollama_tokens_in', record['tokens_in'], model=model)
+    metrics.incr('ollama_tokens_out', record['tokens_out'], model=model)
+    metrics.incr('ollama_queue_wait_seconds', record['queue_wait'], model=model)
+    return response['message']['content']
+
+def chat(prompt, model=LOCAL_LLM, options=None):
+    """
+    Sends a single-turn prompt to Ollama through the shared gateway and returns the reply text.
+    Identical concurrent prompts are generated once and the result is shared.
+    Errors are raised to the caller, like ollama.chat.
+    """
+    key = (model, prompt, repr(sorted((options or {}).items())))
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        leader = future is None
+        if leader:
+            future = _in_flight[key] = Future()
+
+    if not leader:
+        metrics.incr('ollama_coalesced', model=model)
+        return future.result()
+
+    try:
+        future.set_result(_generate(model, prompt, options))
+    except Exception as e:
+        future.set_exception(e)
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(key, None)
+    return future.result()
+
+def warm_up(model=LOCAL_LLM):
+    """
+    Loads the model into memory ahead of the first request and keeps it resident.
+    """
+    try:
+        _client.generate(model=model, prompt='', keep_alive=OLLAMA_KEEP_ALIVE)
+        return True
+    except Exception as e:
+        print(f"Could not warm up {model}: {e}")
+        return False
+
+def get_metrics():
+    """
+    Returns the recent per-call latency breakdowns (seconds): queue_wait, load, prefill, generation, total.
+    """
+    with _metrics_lock:
+        return list(_metrics)
@@ -0,0 +1,73 @@
+# Components/lru.py
+
+import threading
+from collections import OrderedDict
+
+class BoundedLRU:
+    """
+    Thread-safe LRU mapping bounded by an entry count and a byte budget (either may be None for no limit).
+    Each value is stored with its size in bytes, given by the caller.
+    on_evict, if given, is called with (key, value) for every evicted entry, outside the lock.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, on_evict=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        Returns the value for a key and marks it as most recently used.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, nbytes, keep=1):
+        """
+        Stores a value as most recently used, then evicts the least recently used entries while over budget.
+        The `keep` newest entries are never evicted, even if they alone exceed the budget.
+        Returns the evicted (key, value) pairs.
+        """
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self.total_bytes += nbytes
+            while len(self._entries) > keep and self._over_budget():
+                evicted_key, (evicted_value, evicted_bytes) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_bytes
+                evicted.append((evicted_key, evicted_value))
+        if self.on_evict is not None:
+            for evicted_key, evicted_value in evicted:
+                self.on_evict(evicted_key, evicted_value)
+        return evicted
+
+    def _over_budget(self):
+        return ((self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_bytes is not None and self.total_bytes > self.max_bytes))
+
+    def items(self):
+        """
+        Returns a snapshot of the (key, value) pairs, least recently used first.
+        """
+        with self._lock:
+            return [(key, entry[0]) for key, entry in self._entries.items()]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
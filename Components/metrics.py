@@ -0,0 +1,187 @@
+# Components/metrics.py
+
+import os
+import json
+import time
+import atexit
+import shutil
+import cProfile
+import threading
+import subprocess
+from contextlib import contextmanager, nullcontext
+from Components.constants import *
+
+_NULL_SPAN = nullcontext()
+_lock = threading.Lock()
+_write_lock = threading.Lock()  # Serializes appends to events.jsonl; never held together with a span
+_profile_lock = threading.Lock()  # At most one profiled request per process
+_stages = {}    # (stage, labels) -> [count, total_seconds, max_seconds]
+_counters = {}  # (name, labels) -> value
+_events = []    # Span events not yet appended to events.jsonl
+EVENTS_FLUSH_SIZE = 100  # Buffered events that trigger an append
+
+def enabled():
+    return METRICS_ENABLED
+
+def _labels_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def flush_events():
+    """
+    Appends the buffered span events to events.jsonl.
+    Spans only take the aggregate lock to buffer their event, so they never wait on disk I/O.
+    """
+    with _write_lock:
+        with _lock:
+            events = _events[:]
+            del _events[:]
+        if not events:
+            return
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        with open(os.path.join(METRICS_DIR, 'events.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(event) + '\n' for event in events))
+
+atexit.register(flush_events)
+
+@contextmanager
+def _span(stage, labels):
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        # Per-video labels go to the event log only, to keep the aggregate series small
+        key = (stage, _labels_key({k: v for k, v in labels.items() if k != 'video'}))
+        with _lock:
+            stats = _stages.setdefault(key, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+            _events.append({'type': 'span', 'stage': stage, 'seconds': elapsed, 'error': error, 'ts': time.time(), **labels})
+            flush = len(_events) >= EVENTS_FLUSH_SIZE
+        if flush:
+            flush_events()
+
+def span(stage, **labels):
+    """
+    Times a pipeline stage: `with metrics.span('transcript', video=video_id): ...`
+    Returns a shared no-op context when metrics are disabled.
+    """
+    if not METRICS_ENABLED:
+        return _NULL_SPAN
+    return _span(stage, labels)
+
+def incr(name, value=1, **labels):
+    """
+    Increments a counter such as cache hits, retries or tokens in/out.
+    """
+    if not METRICS_ENABLED:
+        return
+    key = (name, _labels_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def snapshot():
+    """
+    Returns the aggregated stage timings and counters.
+    """
+    with _lock:
+        return {
+            'stages': [{'stage': stage, 'labels': dict(labels), 'count': s[0], 'seconds': s[1], 'max_seconds': s[2]}
+                       for (stage, labels), s in _stages.items()],
+            'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                         for (name, labels), value in _counters.items()],
+        }
+
+def _escape_label(value):
+    # The text format requires backslash, double quote and newline to be escaped in label values
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _prom_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape_label(v)}"' for k, v in labels) + '}'
+
+def export_prometheus(path=None):
+    """
+    Writes the aggregates in the Prometheus text format, e.g. for a node_exporter textfile collector.
+    Also flushes the buffered span events.
+    """
+    if not METRICS_ENABLED:
+        return None
+    flush_events()
+    path = path or os.path.join(METRICS_DIR, 'metrics.prom')
+    lines = [
+        '# TYPE travel_agent_stage_seconds summary',
+    ]
+    with _lock:
+        for (stage, labels), (count, total, _) in sorted(_stages.items()):
+            label_str = _prom_labels((('stage', stage),) + labels)
+            lines.append(f'travel_agent_stage_seconds_count{label_str} {count}')
+            lines.append(f'travel_agent_stage_seconds_sum{label_str} {total:.6f}')
+        previous_name = None
+        for (name, labels), value in sorted(_counters.items()):
+            # One TYPE line per metric family, before all of its label sets
+            if name != previous_name:
+                lines.append(f'# TYPE travel_agent_{name}_total counter')
+                previous_name = name
+            lines.append(f'travel_agent_{name}_total{_prom_labels(labels)} {value}')
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp_path, path)
+    return path
+
+def profiler_enabled():
+    return PROFILER in ('cprofile', 'py-spy')
+
+@contextmanager
+def profile(name, requested=False):
+    """
+    Profiles a single request that opted in (requested=True) when TRAVEL_AGENT_PROFILER is "cprofile" or "py-spy".
+    Only one request is profiled at a time; others run unprofiled rather than wait.
+    Output goes to METRICS_DIR/<name>-<timestamp>.prof (cProfile) or .svg (py-spy flame graph).
+    """
+    if not (requested and profiler_enabled()):
+        yield
+        return
+    # cProfile refuses to start while another profiler is active, and two py-spy runs would sample each other
+    if not _profile_lock.acquire(blocking=False):
+        print(f"Another request is being profiled; {name} runs unprofiled.")
+        yield
+        return
+
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        stem = os.path.join(METRICS_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}")
+
+        if PROFILER == 'py-spy':
+            if shutil.which('py-spy') is None:
+                print("py-spy is not installed; skipping profile.")
+                yield
+                return
+            # py-spy samples this process from the outside until the request finishes
+            spy = subprocess.Popen(['py-spy', 'record', '--pid', str(os.getpid()), '--output', f"{stem}.svg"],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                yield
+            finally:
+                spy.terminate()
+                spy.wait()
+            return
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(f"{stem}.prof")
+    finally:
+        _profile_lock.release()
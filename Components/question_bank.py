@@ -0,0 +1,170 @@
+# Components/question_bank.py
+
+import os
+import re
+import json
+import argparse
+import threading
+from Components.constants import *
+from Components.agent import generate_question, generate_llm_response
+
+_lock = threading.Lock()
+_update_lock = threading.Lock()  # Serializes load -> modify -> save, so concurrent updates never drop each other
+_bank = None
+_bank_mtime = None
+
+def _key(city):
+    return city.strip().lower()
+
+def load_question_bank(path=QUESTION_BANK_PATH):
+    """
+    Loads the question bank from disk, reloading only when the file has changed.
+    Format: {city_key: {"city": str, "questions": str, "answers": {question: answer}}}
+    """
+    global _bank, _bank_mtime
+    with _lock:
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        if _bank is None or mtime != _bank_mtime:
+            if mtime is None:
+                _bank = {}
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    _bank = json.load(f)
+            _bank_mtime = mtime
+        return _bank
+
+def save_question_bank(bank, path=QUESTION_BANK_PATH):
+    """
+    Writes the question bank atomically so readers never see a partial file.
+    """
+    global _bank, _bank_mtime
+    with _lock:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(bank, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        _bank = bank
+        _bank_mtime = os.path.getmtime(path)
+
+def update_city(city, update):
+    """
+    Replaces a city's entry with update(current_entry) and saves the bank, atomically with respect to other updates.
+    """
+    with _update_lock:
+        bank = dict(load_question_bank())
+        bank[_key(city)] = update(bank.get(_key(city)))
+        save_question_bank(bank)
+        return bank
+
+def parse_questions(questions_text):
+    """
+    Splits a numbered list ("1. ...", "2) ...") into individual questions.
+    """
+    questions = []
+    for line in questions_text.split('\n'):
+        match = re.match(r"^\s*\d+[\.\)]\s*(.+)$", line)
+        if match:
+            questions.append(match.group(1).strip())
+    return questions
+
+def get_questions(city):
+    """
+    Returns the top 10 questions for a single city from the bank.
+    Unseen cities are generated live with the LLM and added to the bank.
+    """
+    bank = load_question_bank()
+    entry = bank.get(_key(city))
+    if entry:
+        return entry['questions']
+
+    questions_text = generate_question(city)
+    if not questions_text.startswith("Error"):
+        # Keep an entry another session stored meanwhile, with any answers it has
+        update_city(city, lambda current: current or {'city': city, 'questions': questions_text, 'answers': {}})
+    return questions_text
+
+def get_answer(city, question):
+    """
+    Returns the pre-computed answer to a bank question, or None if it was not pre-answered.
+    """
+    entry = load_question_bank().get(_key(city))
+    if not entry:
+        return None
+    return entry.get('answers', {}).get(question)
+
+def pre_answer_questions(city, videos_df, top_k=3):
+    """
+    Answers every bank question for a city against an index built from that city's videos only.
+    """
+    # Imported here so building the question bank alone does not load the DPR models
+    from Components.DPR import encode_passage, faiss_vector_store, search_relevant_passages
+
+    entry = load_question_bank().get(_key(city))
+    if not entry:
+        return 0
+
+    faiss_index = faiss_vector_store(encode_passage(videos_df))
+    answers = dict(entry.get('answers', {}))
+    for question in parse_questions(entry['questions']):
+        if question in answers:
+            continue
+        top_k_videos = search_relevant_passages(videos_df, question, faiss_index, top_k=top_k)
+        context = "\n".join(top_k_videos['Summary'].tolist())
+        answer = generate_llm_response(question, context)
+        if not answer.startswith("Error"):
+            answers[question] = answer
+
+    # Merge into the entry as it is now, in case another session changed it meanwhile
+    def merge_answers(current):
+        current = current or entry
+        return dict(current, answers={**current.get('answers', {}), **answers})
+
+    update_city(city, merge_answers)
+    return len(answers)
+
+def build_question_bank(cities, overwrite=False):
+    """
+    Generates questions for every city in a batch and stores them in the bank.
+    """
+    bank = load_question_bank()
+    for city in cities:
+        if _key(city) in bank and not overwrite:
+            print(f"Skipping {city}: already in the question bank.")
+            continue
+        questions_text = generate_question(city)
+        if questions_text.startswith("Error"):
+            print(f"Failed to generate questions for {city}: {questions_text}")
+            continue
+        # Save after each city so an interrupted run keeps its progress
+        bank = update_city(city, lambda current: {'city': city, 'questions': questions_text, 'answers': {}})
+        print(f"Questions generated for {city}.")
+    return bank
+
+if __name__ == "__main__":
+    # Example: python -m Components.question_bank --cities Amsterdam --answers
+    default_cities = list(DESTINATION_PREFERENCES) + [c.strip() for c in DESTINATION.split(',')]
+    parser = argparse.ArgumentParser(description="Precompute the destination question bank.")
+    parser.add_argument('--cities', nargs='+', default=sorted(set(default_cities)), help="Destinations to generate questions for.")
+    parser.add_argument('--overwrite', action='store_true', help="Regenerate questions for cities already in the bank.")
+    parser.add_argument('--answers', action='store_true', help="Pre-answer each city's questions from its precomputed corpus (see batch.py).")
+    parser.add_argument('--answers-csv', help="Summarized videos CSV of a single city used to pre-answer its questions.")
+    args = parser.parse_args()
+    if args.answers_csv and len(args.cities) != 1:
+        parser.error("--answers-csv holds the videos of one destination; pass exactly one city with --cities.")
+
+    build_question_bank(args.cities, overwrite=args.overwrite)
+
+    # Answers must come from the city's own videos, never from another destination's corpus
+    if args.answers_csv:
+        import pandas as pd
+        city = args.cities[0]
+        count = pre_answer_questions(city, pd.read_csv(args.answers_csv).fillna(''))
+        print(f"{count} answers stored for {city}.")
+    elif args.answers:
+        from Components.corpus import has_stage, load_stage
+        for city in args.cities:
+            if not has_stage(city, 'summaries'):
+                print(f"Skipping answers for {city}: no precomputed corpus (run batch.py first).")
+                continue
+            count = pre_answer_questions(city, load_stage(city, 'summaries'))
+            print(f"{count} answers stored for {city}.")
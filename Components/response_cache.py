@@ -0,0 +1,94 @@
+# Components/response_cache.py
+
+import time
+import threading
+import numpy as np
+from collections import OrderedDict
+from Components import metrics
+from Components.constants import *
+
+class SemanticResponseCache:
+    """
+    Caches chat answers per index fingerprint and reuses them for semantically similar questions.
+    Questions are compared with their normalized DPR question embeddings (cosine similarity).
+    Answers are scoped to the index they were generated from, so a new index never serves stale answers.
+    The key may also be a tuple of fingerprints (e.g. the index shards a question was routed to).
+    """
+
+    def __init__(self, threshold=SEMANTIC_CACHE_THRESHOLD, ttl=SEMANTIC_CACHE_TTL,
+                 max_entries=SEMANTIC_CACHE_MAX_ENTRIES, max_indexes=SEMANTIC_CACHE_MAX_INDEXES):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_indexes = max_indexes
+        self.hits = 0
+        self.misses = 0
+        self._buckets = OrderedDict()  # fingerprint (or tuple of fingerprints) -> list of (embedding, question, answer, created_at)
+        self._lock = threading.Lock()
+
+    def _live_entries(self, fingerprint, now):
+        entries = [entry for entry in self._buckets.get(fingerprint, []) if now - entry[3] < self.ttl]
+        if fingerprint in self._buckets:
+            self._buckets[fingerprint] = entries
+        return entries
+
+    def lookup(self, fingerprint, query_embedding):
+        """
+        Returns (answer, similarity) for the closest cached question above the threshold, else (None, best_similarity).
+        """
+        now = time.time()
+        with self._lock:
+            entries = self._live_entries(fingerprint, now)
+            if not entries:
+                self.misses += 1
+                metrics.incr('response_cache', result='miss')
+                return None, 0.0
+
+            matrix = np.vstack([entry[0] for entry in entries])
+            similarities = matrix @ np.asarray(query_embedding, dtype='float32').reshape(-1)
+            best = int(np.argmax(similarities))
+            best_similarity = float(similarities[best])
+
+            if best_similarity >= self.threshold:
+                self.hits += 1
+                metrics.incr('response_cache', result='hit')
+                self._buckets.move_to_end(fingerprint)
+                return entries[best][2], best_similarity
+
+            self.misses += 1
+            metrics.incr('response_cache', result='miss')
+            return None, best_similarity
+
+    def store(self, fingerprint, query_embedding, question, answer):
+        embedding = np.asarray(query_embedding, dtype='float32').reshape(-1)
+        with self._lock:
+            entries = self._live_entries(fingerprint, time.time())
+            entries.append((embedding, question, answer, time.time()))
+            # Keep the most recent answers for this index
+            self._buckets[fingerprint] = entries[-self.max_entries:]
+            self._buckets.move_to_end(fingerprint)
+            while len(self._buckets) > self.max_indexes:
+                self._buckets.popitem(last=False)
+
+    def invalidate(self, fingerprint=None):
+        """
+        Drops cached answers for one index fingerprint, including every key that contains it,
+        or for all indexes when none is given.
+        """
+        with self._lock:
+            if fingerprint is None:
+                self._buckets.clear()
+                return
+            for key in list(self._buckets):
+                if key == fingerprint or (isinstance(key, tuple) and fingerprint in key):
+                    del self._buckets[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': sum(len(entries) for entries in self._buckets.values()),
+            }
@@ -0,0 +1,67 @@
+# Components/results_view.py
+
+import time
+import math
+import streamlit as st
+from Components.constants import *
+
+def truncate_text(text, max_chars=SUMMARY_PREVIEW_CHARS):
+    """
+    Truncates text on a word boundary so only a preview is sent to the browser.
+    """
+    if text is None:
+        return ""
+    text = str(text)
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(' ', 1)[0] + " …"
+
+def format_video_row(number, title, duration, views, channel, link, summary):
+    """
+    Builds the markdown for one result row. Only the current page is formatted, so this stays cheap
+    without memoization (hashing and pickling the summary would cost more than the f-string).
+    """
+    lines = [
+        f"**{number}. {title}**",
+        f"Duration: {duration} | Views: {views} | Channel: {channel} | [Watch Video]({link})",
+    ]
+    if summary:
+        lines.append(f"Summary: {truncate_text(summary)}")
+    return "  \n".join(lines)
+
+def render_video_results(videos_df, key='results'):
+    """
+    Renders one page of the videos DataFrame. Full transcripts and summaries are only sent on demand.
+
+    Returns:
+    - elapsed_ms (float): Server-side time spent rendering the page.
+    """
+    start = time.perf_counter()
+
+    total = len(videos_df)
+    num_pages = max(1, math.ceil(total / RESULTS_PAGE_SIZE))
+    page = st.number_input(f"Page (1-{num_pages})", min_value=1, max_value=num_pages, value=1, step=1, key=f"{key}_page")
+    first = (int(page) - 1) * RESULTS_PAGE_SIZE
+    page_df = videos_df.iloc[first:first + RESULTS_PAGE_SIZE]
+
+    has_transcript = 'Transcript' in page_df.columns
+    has_summary = 'Summary' in page_df.columns
+
+    for offset, row in enumerate(page_df.to_dict('records')):
+        number = first + offset + 1
+        summary = row.get('Summary') if has_summary else None
+        st.markdown(format_video_row(
+            number, row['Title'], row['Duration'], row['Views'], row['Channel'], row['Link'], summary
+        ))
+
+        # Long text stays on the server until the user asks for it
+        if has_transcript and row.get('Transcript'):
+            if st.checkbox("Show full text", key=f"{key}_text_{number}"):
+                if summary:
+                    st.markdown(f"**Summary:** {summary}")
+                st.markdown(f"**Transcript:** {row['Transcript']}")
+        st.markdown("---")
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    st.caption(f"Showing {len(page_df)} of {total} videos (page {int(page)} of {num_pages}) · rendered in {elapsed_ms:.1f} ms")
+    return elapsed_ms
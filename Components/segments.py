@@ -0,0 +1,119 @@
+# Components/segments.py
+
+import re
+import numpy as np
+from Components.constants import *
+from Components.lru import BoundedLRU
+
+class TranscriptSegments:
+    """
+    Segment timing for one transcript, stored as two NumPy arrays instead of a list of dicts.
+    offsets[i] is the character offset of segment i inside the joined transcript text
+    (' '.join of the segment texts); starts[i] is its start time in seconds.
+    """
+    __slots__ = ('offsets', 'starts')
+
+    def __init__(self, offsets, starts):
+        self.offsets = offsets
+        self.starts = starts
+
+    @classmethod
+    def from_segments(cls, transcript_list):
+        """
+        Builds the arrays from youtube_transcript_api segments and returns (segments, transcript text).
+        """
+        texts = [segment['text'] for segment in transcript_list]
+        lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+        # Each segment starts after the previous ones plus their joining spaces
+        offsets = np.zeros(len(texts), dtype=np.int32)
+        if len(texts) > 1:
+            offsets[1:] = np.cumsum(lengths[:-1] + 1)
+        starts = np.fromiter((segment.get('start', 0.0) for segment in transcript_list), dtype=np.float32, count=len(texts))
+        return cls(offsets, starts), ' '.join(texts)
+
+    def timestamp_at(self, char_offset):
+        """
+        Returns the video time (seconds) of the segment containing a character offset, in O(log n).
+        """
+        if len(self.offsets) == 0:
+            return 0.0
+        i = int(np.searchsorted(self.offsets, char_offset, side='right')) - 1
+        return float(self.starts[max(i, 0)])
+
+    @property
+    def nbytes(self):
+        return self.offsets.nbytes + self.starts.nbytes
+
+class SegmentStore:
+    """
+    Process-wide LRU store of segment timings keyed by video ID. The transcript text itself is not duplicated here.
+    Least recently used timings are evicted once either the entry count or the byte budget is exceeded;
+    links to evicted videos simply have no start time.
+    """
+
+    def __init__(self, max_entries=SEGMENT_STORE_MAX_ENTRIES, max_bytes=SEGMENT_STORE_MAX_BYTES):
+        self._segments = BoundedLRU(max_entries, max_bytes)
+
+    def __len__(self):
+        return len(self._segments)
+
+    def add(self, video_id, transcript_list):
+        """
+        Stores the timings of a fetched transcript and returns the joined transcript text.
+        """
+        segments, transcript = TranscriptSegments.from_segments(transcript_list)
+        self._segments.put(video_id, segments, segments.nbytes)
+        return transcript
+
+    def get(self, video_id):
+        return self._segments.get(video_id)
+
+    def timestamp_at(self, video_id, char_offset):
+        segments = self.get(video_id)
+        return segments.timestamp_at(char_offset) if segments is not None else None
+
+    def save(self, path, video_ids=None):
+        """
+        Saves the timings of the given videos (default: all) to a single .npz file.
+        """
+        if video_ids is None:
+            items = self._segments.items()
+        else:
+            items = [(vid, segments) for vid, segments in zip(video_ids, map(self._segments.get, video_ids)) if segments is not None]
+        arrays = {}
+        for vid, segments in items:
+            arrays[f"{vid}__offsets"] = segments.offsets
+            arrays[f"{vid}__starts"] = segments.starts
+        np.savez_compressed(path, **arrays)
+
+    def load(self, path):
+        with np.load(path) as data:
+            video_ids = {key.rsplit('__', 1)[0] for key in data.files}
+            for vid in video_ids:
+                segments = TranscriptSegments(data[f"{vid}__offsets"], data[f"{vid}__starts"])
+                self._segments.put(vid, segments, segments.nbytes)
+
+SEGMENTS = SegmentStore()
+
+def find_passage_offset(transcript, query):
+    """
+    Finds where a query is best anchored in a transcript: the first occurrence of its rarest word.
+    Returns 0 when no query word (longer than 3 letters) appears.
+    """
+    text = str(transcript).lower()
+    words = {w for w in re.findall(r"[a-z']+", query.lower()) if len(w) > 3}
+    best_offset, best_count = 0, None
+    for word in sorted(words):
+        matches = [m.start() for m in re.finditer(r'\b' + re.escape(word) + r'\b', text)]
+        if matches and (best_count is None or len(matches) < best_count):
+            best_offset, best_count = matches[0], len(matches)
+    return best_offset
+
+def timestamped_link(link, seconds):
+    """
+    Adds a start time to a YouTube watch link: ...watch?v=ID -> ...watch?v=ID&t=95s
+    """
+    if seconds is None:
+        return link
+    separator = '&' if '?' in link else '?'
+    return f"{link}{separator}t={int(seconds)}s"
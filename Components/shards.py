@@ -0,0 +1,66 @@
+# Components/shards.py
+
+import re
+import pandas as pd
+from Components.DPR import encode_query, search_relevant_passages
+
+ALL_DESTINATIONS = "All"  # Shard name for videos without a destination (e.g. older CSV corpora)
+
+def split_destinations(destination):
+    """
+    Splits the destination input into individual destinations: "Amsterdam, Dubai" -> ["Amsterdam", "Dubai"].
+    """
+    return [d.strip() for d in destination.split(',') if d.strip()]
+
+def shard_frames(videos_df):
+    """
+    Splits the videos into one DataFrame per destination.
+    Row order inside each shard is preserved, so a shard's index rows map back with iloc.
+    """
+    if 'Destination' not in videos_df.columns:
+        return {ALL_DESTINATIONS: videos_df.reset_index(drop=True)}
+    return {
+        destination: shard_df.reset_index(drop=True)
+        for destination, shard_df in videos_df.groupby('Destination', sort=False)
+    }
+
+def route_query(query, destinations):
+    """
+    Picks the shards a query should search: the destinations it names, or all of them if it names none.
+    """
+    query_text = query.lower()
+    routed = [
+        d for d in destinations
+        if d != ALL_DESTINATIONS and re.search(r'\b' + re.escape(d.lower()) + r'\b', query_text)
+    ]
+    return routed or list(destinations)
+
+def search_shards(shards, query, top_k=3, query_embedding=None):
+    """
+    Searches only the routed shards and merges their results by similarity.
+
+    Parameters:
+    - shards (dict): destination -> (shard_df, faiss_index).
+
+    Returns:
+    - top_k_videos (DataFrame): The best matches across the routed shards, with a Destination column.
+    """
+    # Encode the query once for every shard
+    if query_embedding is None:
+        query_embedding = encode_query(query)
+
+    results = []
+    for destination in route_query(query, list(shards)):
+        shard_df, faiss_index = shards[destination]
+        k = min(top_k, faiss_index.ntotal)  # FAISS pads missing results with -1
+        if k == 0:
+            continue
+        shard_results = search_relevant_passages(shard_df, query, faiss_index, top_k=k, query_embedding=query_embedding)
+        if destination != ALL_DESTINATIONS:
+            shard_results['Destination'] = destination
+        results.append(shard_results)
+
+    if not results:
+        return pd.DataFrame(columns=['Summary', 'Similarity Score'])
+    merged = pd.concat(results, ignore_index=True)
+    return merged.sort_values('Similarity Score', ascending=False).head(top_k).reset_index(drop=True)
@@ -1,6 +1,9 @@
 import re
+import threading
+from functools import lru_cache
 from Components.constants import *
 from Components.transcript import *
+from Components import metrics
 from transformers import AutoTokenizer, pipeline
 
 # Clean Text Function
@@ -10,20 +13,32 @@ def clean_text(text):
     text = re.sub(r'\s+',' ',text).strip()
     return text
 
+# Load each tokenizer and summarization pipeline once per process
+@lru_cache(maxsize=None)
+def get_tokenizer(model=LLM):
+    return AutoTokenizer.from_pretrained(model)
+
+@lru_cache(maxsize=None)
+def get_summarizer(model=LLM):
+    with metrics.span('load_summarizer', model=model):
+        return pipeline('summarization', model=model)
+
 # Split text into chunks
-def split_text_into_chunks(text, max_tokens=MAX_TOKENS):
-    tokenizer = AutoTokenizer.from_pretrained(LLM)
+def split_text_into_chunks(text, max_tokens=MAX_TOKENS, model=LLM):
+    tokenizer = get_tokenizer(model)
     tokens = tokenizer.encode(text)
+    metrics.incr('summarizer_tokens_in', len(tokens))
     chunks = [tokens[i:i + max_tokens] for i in range(0, len(tokens), max_tokens)]
     return [tokenizer.decode(chunk) for chunk in chunks]
 
 # Summarize Text Function using Facebook LLM via Hugging Face
-def summarize_text(transcript, summarizer_pipeline):
+def summarize_text(transcript, summarizer_pipeline, profile=DEFAULT_SUMMARY_PROFILE):
     """
     Summarizes the provided transcript using the BART model.
 
     Parameters:
     - transcript (str): The video transcript to summarize.
+    - profile (str): Key of SUMMARY_PROFILES giving the decoding settings.
 
     Returns:
     - summary (str): The summarized text or an error message.
@@ -31,10 +46,20 @@ def summarize_text(transcript, summarizer_pipeline):
     try:
         # Split the text into chunks
         t = clean_text(transcript)
-        chunks = split_text_into_chunks(t)
+        settings = SUMMARY_PROFILES[profile]
+        chunks = split_text_into_chunks(t, model=settings['model'])
 
         # Summarize each chunk
-        summaries = [summarizer_pipeline(chunk, max_length=140, min_length=30, do_sample=False)[0]['summary_text'] for chunk in chunks]
+        summaries = [
+            summarizer_pipeline(
+                chunk,
+                max_length=settings['max_length'],
+                min_length=settings['min_length'],
+                num_beams=settings['num_beams'],
+                do_sample=False
+            )[0]['summary_text']
+            for chunk in chunks
+        ]
 
         # Combine the summaries if needed
         result = " ".join(summaries)
@@ -48,20 +73,22 @@ def summarize_text(transcript, summarizer_pipeline):
         return f"Error summarizing transcript: {e}"
 
 # Summarize the transcripts in the DataFrame
-def generate_summaries(videos_df):
+def generate_summaries(videos_df, profile=DEFAULT_SUMMARY_PROFILE):
     """
     Iterates over each video's transcript and generates summaries using the provided summarizer.
 
     Parameters:
     - videos_df (DataFrame): The DataFrame containing videos with transcripts.
+    - profile (str): "fast", "balanced" or "quality" (see SUMMARY_PROFILES).
 
     Returns:
     - videos_df (DataFrame): The updated DataFrame with summaries.
     """
-    summarizer_pipeline = pipeline('summarization', model=LLM)
+    summarizer_pipeline = get_summarizer(SUMMARY_PROFILES[profile]['model'])
 
-    # Initialize a new column for summaries
+    # Initialize new columns for summaries and the profile that produced them
     videos_df['Summary'] = None
+    videos_df['SummaryProfile'] = profile
 
     # Iterate over each transcript and generate summaries
     for index, row in videos_df.iterrows():
@@ -71,7 +98,8 @@ def generate_summaries(videos_df):
         if transcript and 'transcripts are disabled' not in transcript.lower() and 'no transcript found' not in transcript.lower():
             print(f'Summarizing transcript for video: {video_title}')
             try:
-                summary = summarize_text(transcript, summarizer_pipeline)
+                with metrics.span('summarize', video=video_title, profile=profile):
+                    summary = summarize_text(transcript, summarizer_pipeline, profile)
                 videos_df.at[index, 'Summary'] = summary
                 print(f'Summary generated for video: {video_title}')
             except Exception as e:
@@ -82,3 +110,16 @@ def generate_summaries(videos_df):
             videos_df.at[index, 'Summary'] = 'No transcript found for this video.'
 
     return videos_df
+
+def refine_summaries_in_background(videos_df, on_done, profile="quality"):
+    """
+    Regenerates summaries with a slower, higher-quality profile on a background thread.
+    on_done(refined_df) is called with the refined copy once every video is done.
+    """
+    def refine():
+        refined_df = generate_summaries(videos_df.copy(), profile)
+        on_done(refined_df)
+
+    thread = threading.Thread(target=refine, daemon=True)
+    thread.start()
+    return thread
@@ -1,8 +1,11 @@
 # Components/transcript.py
 
 import re
+import hashlib
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 import streamlit as st  # Import Streamlit for displaying messages
+from Components import metrics
+from Components.segments import SEGMENTS
 
 def extract_video_id(youtube_url):
     """
@@ -14,6 +17,12 @@ def extract_video_id(youtube_url):
     else:
         return None
 
+def hash_transcript(transcript):
+    """
+    Returns a short content hash of a transcript, used to fingerprint indexes.
+    """
+    return hashlib.sha1(str(transcript).encode('utf-8')).hexdigest()[:16]
+
 def extract_transcripts(videos_df):
     """
     Extracts transcripts for each video in the DataFrame.
@@ -30,13 +39,15 @@ def extract_transcripts(videos_df):
         if video_id:
             try:
                 # Fetch the transcript using the video ID
-                transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=['en'])
+                with metrics.span('transcript', video=video_id):
+                    transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=['en'])
                 
-                # Combine the transcript segments into a single string
-                transcript = ' '.join([segment['text'] for segment in transcript_list])
+                # Combine the transcript segments into a single string, keeping each segment's start time
+                transcript = SEGMENTS.add(video_id, transcript_list)
                 
                 # Assign the transcript to the DataFrame
                 videos_df.at[index, 'Transcript'] = transcript
+                metrics.incr('transcripts', status='ok')
 
                 # Debug message
                 st.write(f"✅ Transcript extracted for video: **{video_title}**")
@@ -44,16 +55,22 @@ def extract_transcripts(videos_df):
             except TranscriptsDisabled:
                 st.write(f"⚠️ Transcripts are disabled for this video: **{video_title}**.")
                 videos_df.at[index, 'Transcript'] = "Transcripts are disabled for this video."
+                metrics.incr('transcripts', status='disabled')
                 
             except NoTranscriptFound:
                 st.write(f"⚠️ No transcript found for this video: **{video_title}**.")
                 videos_df.at[index, 'Transcript'] = "No transcript found for this video."
+                metrics.incr('transcripts', status='not_found')
                 
             except Exception as e:
                 st.write(f"❌ An error occurred while fetching transcript for **{video_title}**: {str(e)}")
                 videos_df.at[index, 'Transcript'] = "Error occurred while fetching transcript."
+                metrics.incr('transcripts', status='error')
         else:
             st.write(f"❌ Invalid YouTube URL for video: **{video_title}**.")
             videos_df.at[index, 'Transcript'] = "Invalid YouTube URL."
 
+    # Hash each transcript once here so downstream caches don't rehash the text
+    videos_df['TranscriptHash'] = videos_df['Transcript'].map(hash_transcript)
+
     return videos_df
@@ -0,0 +1,124 @@
+# Components/video_store.py
+
+import sys
+import threading
+import pandas as pd
+from Components.constants import *
+from Components.lru import BoundedLRU
+from Components.transcript import extract_video_id
+
+# DataFrame column -> VideoRecord attribute
+COLUMNS = {
+    'Title': 'title',
+    'Duration': 'duration',
+    'DurationMinutes': 'duration_minutes',
+    'Views': 'views',
+    'Channel': 'channel',
+    'Link': 'link',
+    'Transcript': 'transcript',
+    'TranscriptHash': 'transcript_hash',
+    'Summary': 'summary',
+    'SummaryProfile': 'summary_profile',
+}
+
+# Columns filled by a pipeline stage; a view only has them once every one of its videos reached that stage
+STAGE_COLUMNS = ('Transcript', 'TranscriptHash', 'Summary', 'SummaryProfile')
+
+# Summary profiles from lowest to highest quality; summaries without a profile (e.g. CSV corpora) count as the default
+SUMMARY_RANKS = {profile: rank for rank, profile in enumerate(SUMMARY_PROFILES)}
+
+def summary_rank(profile):
+    return SUMMARY_RANKS.get(profile, SUMMARY_RANKS[DEFAULT_SUMMARY_PROFILE])
+
+class VideoRecord:
+    """
+    Compact per-video record. One instance per video ID is shared by every session.
+    """
+    __slots__ = ('video_id',) + tuple(COLUMNS.values())
+
+    def __init__(self, video_id):
+        self.video_id = video_id
+        for attr in COLUMNS.values():
+            setattr(self, attr, None)
+
+    @property
+    def nbytes(self):
+        # The long strings dominate; the short fields are interned and shared
+        return sum(len(value) for value in (self.transcript, self.summary) if isinstance(value, str))
+
+class VideoStore:
+    """
+    Process-wide LRU store of video records keyed by video ID.
+    Sessions only keep the list of IDs they fetched and rebuild a DataFrame view on demand;
+    the transcript and summary strings are shared rather than copied per session.
+    Least recently used records are evicted once either the record count or the text budget is exceeded.
+    Per-session tags such as a video's destination are kept in the session, not on the shared record.
+    """
+
+    def __init__(self, max_entries=VIDEO_STORE_MAX_ENTRIES, max_bytes=VIDEO_STORE_MAX_BYTES):
+        self._records = BoundedLRU(max_entries, max_bytes)
+        self._lock = threading.Lock()  # Serializes read-modify-write of the records
+
+    def __len__(self):
+        return len(self._records)
+
+    def add_videos(self, videos_df):
+        """
+        Upserts the rows of a DataFrame into the store and returns their video IDs in order.
+        Only non-empty values overwrite existing fields, and a summary never replaces one of a
+        higher-quality profile: sessions share records, so one session's "fast" run must not
+        downgrade another session's "quality" summaries.
+        """
+        columns = [col for col in COLUMNS if col in videos_df.columns]
+        video_ids, batch = [], set()
+        with self._lock:
+            for row in videos_df[columns].itertuples(index=False, name=None):
+                values = dict(zip(columns, row))
+                video_id = extract_video_id(values.get('Link') or '') or values.get('Link')
+                record = self._records.get(video_id) or VideoRecord(video_id)
+                if not self._keeps_summary(record, values):
+                    values.pop('Summary', None)
+                    values.pop('SummaryProfile', None)
+                for col, value in values.items():
+                    if value is None or (isinstance(value, float) and pd.isna(value)):
+                        continue
+                    if col in ('Title', 'Channel', 'Duration', 'TranscriptHash', 'SummaryProfile'):
+                        value = sys.intern(str(value))  # short, highly repeated strings
+                    setattr(record, COLUMNS[col], value)
+                video_ids.append(video_id)
+                batch.add(video_id)
+                # The videos of this batch are the newest entries and are never evicted by it
+                self._records.put(video_id, record, record.nbytes, keep=len(batch))
+        return video_ids
+
+    @staticmethod
+    def _keeps_summary(record, values):
+        # Whether the row's summary may replace the record's current one
+        summary = values.get('Summary')
+        if not isinstance(summary, str) or not summary or record.summary is None:
+            return True
+        failed, had_failed = summary.startswith('Error'), record.summary.startswith('Error')
+        if failed != had_failed:
+            return had_failed  # A real summary always beats a failed one
+        return summary_rank(values.get('SummaryProfile')) >= summary_rank(record.summary_profile)
+
+    def to_dataframe(self, video_ids):
+        """
+        Builds a DataFrame view for the given video IDs. Evicted videos are left out.
+        Columns with no values for any of the videos are left out, and stage columns are only
+        included when every video has them, matching the pipeline stage the whole view reached.
+        """
+        records = [record for record in map(self._records.get, video_ids) if record is not None]
+        if not records:
+            return pd.DataFrame()
+
+        data = {}
+        for col, attr in COLUMNS.items():
+            values = [getattr(record, attr) for record in records]
+            required = all if col in STAGE_COLUMNS else any
+            if required(value is not None for value in values):
+                data[col] = values
+        return pd.DataFrame(data)
+
+    def stats(self):
+        return {'entries': len(self._records), 'bytes': self._records.total_bytes}
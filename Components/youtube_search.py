@@ -1,15 +1,50 @@
 # Search YouTube Videos
+import numpy as np
 import pandas as pd
 from Components.constants import *
 from youtubesearchpython import VideosSearch
+from Components import metrics
+
+# Suffix multipliers used by YouTube's abbreviated view counts ("1.2M views")
+VIEW_MULTIPLIERS = {'': 1, 'k': 1_000, 'm': 1_000_000, 'b': 1_000_000_000}
+VIEWS_PATTERN = r'([\d.,]+)\s*([kmb]?)'
+
+def parse_views_series(views):
+    """
+    Vectorized views parsing over a Series of YouTube view strings.
+    Handles "5,909 views", "1.2M views", "No views" and missing values (parsed as 0).
+    """
+    parts = views.fillna('').astype(str).str.lower().str.extract(VIEWS_PATTERN)
+    numbers = pd.to_numeric(parts[0].str.replace(',', '', regex=False), errors='coerce').fillna(0)
+    multipliers = parts[1].fillna('').map(VIEW_MULTIPLIERS).fillna(1)
+    return (numbers * multipliers).round().astype('int64')
+
+def parse_duration_series(durations):
+    """
+    Vectorized duration parsing over a Series of "MM:SS" or "H:MM:SS" strings, in total minutes.
+    Missing or unexpected formats (e.g. live streams) are parsed as 0.
+    """
+    parts = durations.fillna('').astype(str).str.split(':', expand=True)
+    parts = parts.apply(pd.to_numeric, errors='coerce')
+    num_parts = parts.notna().sum(axis=1)
+
+    minutes = np.zeros(len(parts))
+    if parts.shape[1] >= 2:
+        mm_ss = (num_parts == 2).to_numpy()
+        minutes[mm_ss] = parts[0][mm_ss] + parts[1][mm_ss] / 60
+    if parts.shape[1] >= 3:
+        h_mm_ss = (num_parts == 3).to_numpy()
+        minutes[h_mm_ss] = parts[0][h_mm_ss] * 60 + parts[1][h_mm_ss] + parts[2][h_mm_ss] / 60
+    return pd.Series(minutes, index=durations.index)
 
 def parse_views(views_str):
     """
     Parses the views string from YouTube and converts it to an integer.
     Example: 5,909 views -> 5909
+    Example: 1.2M views -> 1200000
+    Example: No views -> 0
     """
-    views_str = views_str.lower().replace('views', '').replace(",", '').strip()
-    return int(views_str)  # In case of any parsing error
+    return int(parse_views_series(pd.Series([views_str])).iloc[0])
 
 def parse_duration(duration_str):
     """
@@ -17,18 +52,64 @@ def parse_duration(duration_str):
     Example: "5:30" -> 5.5 minutes
     Example: "10:00" -> 10 minutes
     """
-    parts = duration_str.split(':')
-    # Convert to minutes, assuming the format is always "MM:SS" or "H:MM:SS"
-    if len(parts) == 2:  # MM:SS
-        minutes = int(parts[0])
-        seconds = int(parts[1])
-    elif len(parts) == 3:  # H:MM:SS
-        minutes = int(parts[1]) + int(parts[0]) * 60
-        seconds = int(parts[2])
-    else:
-        return 0  # Unexpected format
-    
-    return minutes + (seconds / 60)  # Return total minutes
+    return float(parse_duration_series(pd.Series([duration_str])).iloc[0])
+
+def search_youtube_videos(destination, preferences, MAX_RESULTS, MIN_DURATION=5):
+    """
+    Runs the YouTube search and returns every result, unfiltered, as a columnar DataFrame.
+    Views and durations are parsed once for the whole table.
+
+    Returns:
+    - raw_df (DataFrame): Title, Duration, DurationMinutes, Views, Channel and Link columns.
+    """
+    # Combine the Preferences into a search query
+    preference_query = " and ".join(preferences)  # Use 'and' to connect multiple preferences
+    search_query = f"Comprehensive travel guide to {destination} featuring {preference_query} longer than {MIN_DURATION} minutes"
+
+    # Log the search query for debugging
+    # print(f"Search Query: {search_query}")
+    # Initializing VideoSearch
+    video_search = VideosSearch(search_query, limit=MAX_RESULTS)
+
+    # Execute Search
+    with metrics.span('youtube_search'):
+        search_results = video_search.result()
+
+    results = search_results.get('result') or []
+    raw_df = pd.DataFrame({
+        'Title': [video.get('title') for video in results],
+        'Duration': [video.get('duration') for video in results],  # Keep original duration string for display
+        'Views': [(video.get('viewCount') or {}).get('text') for video in results],
+        'Channel': [(video.get('channel') or {}).get('name') for video in results],
+        'Link': [video.get('link') for video in results],
+    })
+    raw_df['DurationMinutes'] = parse_duration_series(raw_df['Duration'])  # Total duration in minutes
+    raw_df['Views'] = parse_views_series(raw_df['Views'])  # Store as integer
+    return raw_df[['Title', 'Duration', 'DurationMinutes', 'Views', 'Channel', 'Link']]
+
+def filter_videos(raw_df, MIN_VIEWS, MIN_DURATION=5, channels=None, sort_by=None, ascending=False):
+    """
+    Filters and sorts the raw search results with vectorized masks; no network call is made.
+
+    Parameters:
+    - raw_df (DataFrame): Results from search_youtube_videos.
+    - MIN_VIEWS (int): Minimum number of views required.
+    - MIN_DURATION (int): Minimum duration in minutes to include a video.
+    - channels (list): Optional list of channels to keep.
+    - sort_by (str): Optional column to sort by (e.g. 'Views', 'DurationMinutes', 'Channel').
+
+    Returns:
+    - videos_df (DataFrame): The matching videos.
+    """
+    mask = (raw_df['Views'].to_numpy() >= MIN_VIEWS) & (raw_df['DurationMinutes'].to_numpy() >= MIN_DURATION)
+    if channels:
+        mask &= raw_df['Channel'].isin(channels).to_numpy()
+    metrics.incr('videos_filtered', int((~mask).sum()))
+
+    videos_df = raw_df[mask]
+    if sort_by:
+        videos_df = videos_df.sort_values(sort_by, ascending=ascending, kind='stable')
+    return videos_df.reset_index(drop=True)
 
 def fetch_youtube_videos(destination, preferences, MIN_VIEWS, MAX_RESULTS, MIN_DURATION=5):
     """
@@ -44,41 +125,10 @@ def fetch_youtube_videos(destination, preferences, MIN_VIEWS, MAX_RESULTS, MIN_D
     Returns:
     - videos (list): List of dictionaries containing video details with views parsed as integers.
     """
-    # Combine the Preferences into a search query
-    preference_query = " and ".join(preferences)  # Use 'and' to connect multiple preferences
-    search_query = f"Comprehensive travel guide to {destination} featuring {preference_query} longer than {MIN_DURATION} minutes"
-    
-    # Log the search query for debugging
-    # print(f"Search Query: {search_query}")
-    # Initializing VideoSearch
-    video_search = VideosSearch(search_query, limit=MAX_RESULTS)
+    raw_df = search_youtube_videos(destination, preferences, MAX_RESULTS, MIN_DURATION)
 
-    # Execute Search 
-    search_results = video_search.result()
-
-    videos = []
-    for video in search_results['result']:
-        views_str = video['viewCount']['text']
-        views = parse_views(views_str)
-        duration_str = video['duration']
-        duration = parse_duration(duration_str)
-        
-        # Filter out the videos with fewer than MIN_VIEWS or less than MIN_DURATION
-        if views < MIN_VIEWS or duration < MIN_DURATION:
-            continue  # Skip this video
-
-        # Add the video details to the dictionary
-        videos_data = {
-            'Title': video['title'],
-            'Duration': duration_str,  # Keep original duration string for display
-            'DurationMinutes': duration,  # Total duration in minutes (for possible future use)
-            'Views': views,  # Store as integer
-            'Channel': video['channel']['name'],
-            'Link': video['link']
-        }
-        videos.append(videos_data)
-    
-    return videos
+    # Filter out the videos with fewer than MIN_VIEWS or less than MIN_DURATION
+    return filter_videos(raw_df, MIN_VIEWS, MIN_DURATION).to_dict('records')
 
 def display_results(videos):
     """
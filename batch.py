@@ -0,0 +1,163 @@
+# batch.py
+#
+# Headless precomputation of destination corpora:
+# fetch -> transcripts -> summaries -> DPR encoding -> FAISS index, with a checkpoint after every stage.
+# The Streamlit app loads the results instantly with "📦 Load Precomputed Corpus".
+#
+# Usage:
+#   python batch.py --presets                      # every destination in DESTINATION_PREFERENCES
+#   python batch.py --file cities.txt --workers 4  # one destination per line
+#   python batch.py --destinations Paris "New York" --force
+
+import os
+import sys
+import json
+import time
+import argparse
+import warnings
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from Components.constants import *
+from Components import corpus
+
+warnings.filterwarnings("ignore")
+
+def init_worker(threads_per_worker):
+    # Split the cores between worker processes instead of letting every torch pool grab all of them
+    import torch
+    torch.set_num_threads(threads_per_worker)
+
+def process_destination(destination, min_views, max_results, min_duration, force=False):
+    """
+    Runs the full pipeline for one destination, resuming from the last completed stage.
+    """
+    # Imported in the worker so each process loads the models once
+    from Components.youtube_search import fetch_youtube_videos
+    from Components.transcript import extract_transcripts, extract_video_id
+    from Components.segments import SEGMENTS
+    from Components.dedup import deduplicate_videos
+    from Components.summarizer import generate_summaries
+    from Components.DPR import encode_passage, faiss_vector_store
+
+    timings = {}
+    resumed = []
+
+    def run_stage(stage, fn):
+        if not force and corpus.has_stage(destination, stage):
+            resumed.append(stage)
+            return corpus.load_stage(destination, stage)
+        start = time.perf_counter()
+        result = fn()
+        timings[stage] = time.perf_counter() - start
+        corpus.save_stage(destination, stage, result)
+        return result
+
+    preferences = DESTINATION_PREFERENCES.get(destination, DEFAULT_PREFERENCES)
+    started_at = time.perf_counter()
+
+    # Each destination is its own shard: its videos, summaries and index are saved independently
+    videos_df = run_stage('videos', lambda: pd.DataFrame(
+        fetch_youtube_videos(destination, preferences, min_views, max_results, MIN_DURATION=min_duration)
+    ).assign(Destination=destination))
+    if videos_df.empty:
+        return {'destination': destination, 'videos': 0, 'status': 'no videos found', 'timings': timings, 'resumed': resumed}
+
+    # Near-duplicates are dropped right after transcripts so they are never summarized or encoded
+    dedup_report = {}
+
+    def transcripts_stage():
+        deduped_df, report = deduplicate_videos(extract_transcripts(videos_df.copy()))
+        dedup_report.update(report)
+        os.makedirs(corpus.corpus_dir(destination), exist_ok=True)
+        SEGMENTS.save(
+            os.path.join(corpus.corpus_dir(destination), corpus.SEGMENTS_FILE),
+            [extract_video_id(link) for link in deduped_df['Link']]
+        )
+        return deduped_df
+
+    videos_df = run_stage('transcripts', transcripts_stage)
+    videos_df = run_stage('summaries', lambda: generate_summaries(videos_df.copy()))
+    run_stage('index', lambda: faiss_vector_store(encode_passage(videos_df)))
+
+    elapsed = time.perf_counter() - started_at
+    summary = {
+        'destination': destination,
+        'videos': len(videos_df),
+        'status': 'ok',
+        'seconds': elapsed,
+        'videos_per_second': len(videos_df) / elapsed if elapsed > 0 else None,
+        'timings': timings,
+        'resumed': resumed,
+        'duplicates_dropped': dedup_report.get('videos_dropped'),
+        'bart_chunks_skipped': dedup_report.get('bart_chunks_skipped'),
+        'completed_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    corpus.save_manifest(destination, summary)
+    return summary
+
+def read_destinations(args):
+    destinations = list(args.destinations or [])
+    if args.presets:
+        destinations += list(DESTINATION_PREFERENCES)
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            destinations += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    # Keep the first occurrence of each destination
+    return list(dict.fromkeys(destinations))
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute destination corpora for the Travel Agent app.")
+    parser.add_argument('--destinations', nargs='+', help="Destinations to process.")
+    parser.add_argument('--presets', action='store_true', help="Process every destination in DESTINATION_PREFERENCES.")
+    parser.add_argument('--file', help="Text file with one destination per line.")
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 1) // 4), help="Destinations processed in parallel.")
+    parser.add_argument('--min-views', type=int, default=MIN_VIEWS)
+    parser.add_argument('--max-results', type=int, default=MAX_RESULTS)
+    parser.add_argument('--min-duration', type=int, default=MIN_DURATION)
+    parser.add_argument('--force', action='store_true', help="Ignore existing checkpoints and recompute every stage.")
+    parser.add_argument('--report', default=os.path.join(CORPUS_DIR, 'batch_report.json'), help="Where to write the run report.")
+    args = parser.parse_args()
+
+    destinations = read_destinations(args)
+    if not destinations:
+        parser.error("No destinations given. Use --destinations, --presets or --file.")
+
+    workers = max(1, min(args.workers, len(destinations)))
+    threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+    print(f"Processing {len(destinations)} destinations with {workers} workers x {threads_per_worker} threads.")
+
+    results = []
+    started_at = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(threads_per_worker,)) as executor:
+        futures = {
+            executor.submit(process_destination, destination, args.min_views, args.max_results, args.min_duration, args.force): destination
+            for destination in destinations
+        }
+        for future in as_completed(futures):
+            destination = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'destination': destination, 'status': f"error: {e}"}
+            results.append(result)
+            if result.get('status') == 'ok':
+                print(f"✅ {destination}: {result['videos']} videos in {result['seconds']:.1f}s "
+                      f"({result['videos_per_second']:.2f} videos/s, resumed: {', '.join(result['resumed']) or 'none'})")
+            else:
+                print(f"⚠️ {destination}: {result['status']}")
+
+    elapsed = time.perf_counter() - started_at
+    report = {
+        'destinations': len(destinations),
+        'workers': workers,
+        'seconds': elapsed,
+        'results': sorted(results, key=lambda r: r['destination']),
+    }
+    os.makedirs(os.path.dirname(args.report) or '.', exist_ok=True)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Done in {elapsed:.1f}s. Report written to {args.report}")
+    return 0 if all(r.get('status') == 'ok' for r in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
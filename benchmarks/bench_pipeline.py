@@ -0,0 +1,292 @@
+# benchmarks/bench_pipeline.py
+#
+# Offline benchmark of every pipeline stage on the bundled CSV corpus.
+# YouTube search, transcripts and Ollama are replaced by local fakes; the Hugging Face
+# models must already be in the local cache (the run sets HF_HUB_OFFLINE=1).
+#
+# Usage (from the repository root):
+#   python -m benchmarks.bench_pipeline                     # run and compare with the baseline
+#   python -m benchmarks.bench_pipeline --update-baseline   # store this run as the new baseline
+
+import os
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS = os.path.join(BENCH_DIR, "..", "summarized_videos (1).csv")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results.json")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+# ---------------------------------------------------------------------------
+# Local stand-ins for the network backends
+# ---------------------------------------------------------------------------
+
+class FakeVideosSearch:
+    """
+    Mimics youtubesearchpython.VideosSearch, serving results built from the corpus.
+    """
+    corpus = pd.DataFrame()
+
+    def __init__(self, query, limit=20):
+        self.limit = limit
+
+    def result(self):
+        rows = self.corpus.head(self.limit).to_dict('records')
+        return {'result': [{
+            'title': row['Title'],
+            'viewCount': {'text': f"{int(row['Views']):,} views"},
+            'duration': row['Duration'],
+            'channel': {'name': row['Channel']},
+            'link': row['Link'],
+        } for row in rows]}
+
+class FakeTranscriptApi:
+    """
+    Mimics YouTubeTranscriptApi.get_transcript, splitting corpus transcripts into segments.
+    """
+    transcripts = {}
+
+    @classmethod
+    def get_transcript(cls, video_id, languages=None):
+        words = cls.transcripts.get(video_id, '').split()
+        return [{'text': ' '.join(words[i:i + 12]), 'start': i / 2.5, 'duration': 4.8} for i in range(0, len(words), 12)]
+
+class FakeOllamaClient:
+    """
+    Mimics ollama.Client with a fixed, tiny generation cost.
+    """
+    def chat(self, model, messages, options=None, keep_alive=None):
+        time.sleep(0.001)
+        prompt = messages[-1]['content']
+        return {
+            'message': {'role': 'assistant', 'content': "Day 1: Canal tour.\nDay 2: Museums."},
+            'load_duration': 0, 'prompt_eval_duration': 500_000, 'eval_duration': 500_000,
+            'prompt_eval_count': len(prompt.split()), 'eval_count': 8,
+        }
+
+    def generate(self, model, prompt='', keep_alive=None):
+        return {'response': ''}
+
+class FakeSummarizer:
+    """
+    Stand-in for the BART pipeline when --fake-models is given.
+    """
+    def __call__(self, text, max_length=140, min_length=30, do_sample=False, **generate_kwargs):
+        # Accepts the same decoding keywords as the real pipeline (num_beams, ...)
+        return [{'summary_text': ' '.join(text.split()[:max_length])}]
+
+def install_fakes(corpus):
+    import Components.youtube_search as youtube_search
+    import Components.transcript as transcript
+    from Components import llm
+    from Components.transcript import extract_video_id
+
+    FakeVideosSearch.corpus = corpus
+    FakeTranscriptApi.transcripts = {extract_video_id(link): text for link, text in zip(corpus['Link'], corpus['Transcript'])}
+    youtube_search.VideosSearch = FakeVideosSearch
+    transcript.YouTubeTranscriptApi = FakeTranscriptApi
+    llm._client = FakeOllamaClient()
+
+# ---------------------------------------------------------------------------
+# Measurement helpers
+# ---------------------------------------------------------------------------
+
+def peak_rss_mb():
+    # Process-lifetime high-water mark; ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def current_rss_mb():
+    """
+    Current resident set size, falling back to the peak where /proc is not available.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+def measure(name, fn, items, rounds=1):
+    """
+    Calls fn(item) for every item, `rounds` times, and summarizes the per-call latencies.
+    Memory is reported for this stage alone: the RSS growth over the run and the peak
+    Python heap allocation of a single call.
+    """
+    latencies = []
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for item in items:
+            t0 = time.perf_counter()
+            fn(item)
+            latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    rss_delta = current_rss_mb() - rss_before
+
+    latencies_ms = np.array(latencies) * 1000
+    result = {
+        'stage': name,
+        'calls': len(latencies),
+        'throughput_per_s': len(latencies) / elapsed if elapsed > 0 else float('inf'),
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p95_ms': float(np.percentile(latencies_ms, 95)),
+        'rss_delta_mb': rss_delta,
+        'peak_alloc_mb': measure_allocations(fn, items[0]),
+    }
+    print(f"{name:<28} {result['calls']:>6} calls  p50 {result['p50_ms']:>10.3f} ms  p95 {result['p95_ms']:>10.3f} ms  "
+          f"{result['throughput_per_s']:>10.1f}/s  RSS {result['rss_delta_mb']:+.1f} MB  alloc {result['peak_alloc_mb']:.1f} MB")
+    return result
+
+def measure_allocations(fn, item):
+    """
+    Returns the peak Python heap allocation (MB) of a single call.
+    """
+    tracemalloc.start()
+    try:
+        fn(item)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+def compare_with_baseline(results, baseline, tolerance, min_alloc_mb=1.0):
+    """
+    Returns the stages whose p50 latency or peak allocation regressed by more than `tolerance` relative to the baseline.
+    Allocations under min_alloc_mb are ignored, as their ratios are mostly noise.
+    """
+    previous = {stage['stage']: stage for stage in baseline.get('stages', [])}
+    regressions = []
+    for stage in results['stages']:
+        old = previous.get(stage['stage'])
+        if old is None:
+            continue
+        for metric, floor in (('p50_ms', 0), ('peak_alloc_mb', min_alloc_mb)):
+            if old.get(metric) is None or old[metric] <= 0 or stage[metric] < floor:
+                continue
+            ratio = stage[metric] / old[metric]
+            if ratio > 1 + tolerance:
+                regressions.append({'stage': stage['stage'], 'metric': metric, 'baseline': old[metric], 'value': stage[metric], 'ratio': ratio})
+    return regressions
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+def run(args):
+    corpus = pd.read_csv(args.corpus).fillna('')
+    corpus = pd.concat([corpus] * args.scale, ignore_index=True)
+    install_fakes(corpus)
+
+    from Components.constants import MIN_VIEWS, MAX_RESULTS, MIN_DURATION
+    from Components.youtube_search import parse_views, parse_duration, parse_views_series, parse_duration_series, fetch_youtube_videos, search_youtube_videos, filter_videos
+    from Components.transcript import extract_transcripts
+    from Components.summarizer import clean_text, split_text_into_chunks, summarize_text
+    from Components.itinerary import generate_itinerary
+
+    view_strings = [f"{int(v):,} views" for v in corpus['Views']]
+    duration_strings = corpus['Duration'].tolist()
+    transcripts = corpus['Transcript'].tolist()
+    single_rows = [corpus.iloc[[i]] for i in range(len(corpus))]
+
+    stages = [
+        measure('parse_views', parse_views, view_strings, rounds=args.rounds * 100),
+        measure('parse_duration', parse_duration, duration_strings, rounds=args.rounds * 100),
+        measure('parse_views_series', parse_views_series, [pd.Series(view_strings * 100)], rounds=args.rounds),
+        measure('parse_duration_series', parse_duration_series, [pd.Series(duration_strings * 100)], rounds=args.rounds),
+        measure('filter_videos', lambda raw: filter_videos(raw, MIN_VIEWS, MIN_DURATION, sort_by='Views'), [search_youtube_videos("Amsterdam", ["Museums"], len(corpus))], rounds=args.rounds * 10),
+        measure('fetch_youtube_videos[fake]', lambda _: fetch_youtube_videos("Amsterdam", ["Museums"], 0, MAX_RESULTS, MIN_DURATION=0), [None], rounds=args.rounds * 10),
+        measure('extract_transcripts[fake]', lambda df: extract_transcripts(df[['Title', 'Link']].copy()), [corpus], rounds=args.rounds),
+        measure('clean_text', clean_text, transcripts, rounds=args.rounds * 10),
+        measure('split_text_into_chunks', split_text_into_chunks, transcripts, rounds=args.rounds),
+    ]
+
+    if args.fake_models:
+        summarizer_pipeline = FakeSummarizer()
+    else:
+        from transformers import pipeline
+        from Components.constants import LLM
+        summarizer_pipeline = pipeline('summarization', model=LLM)
+    stages.append(measure('summarize_text', lambda t: summarize_text(t, summarizer_pipeline), transcripts[:args.summaries], rounds=1))
+
+    from Components.DPR import encode_passage, faiss_vector_store, search_relevant_passages
+    stages.append(measure('encode_passage', encode_passage, single_rows, rounds=args.rounds))
+    passage_embeddings = encode_passage(corpus)
+    stages.append(measure('faiss_vector_store', lambda e: faiss_vector_store(e.copy()), [passage_embeddings], rounds=args.rounds * 10))
+    faiss_index = faiss_vector_store(passage_embeddings.copy())
+    queries = ["What is the best time to visit?", "Is it expensive?", "What are the top attractions?", "Where should I eat?"]
+    stages.append(measure('search_relevant_passages', lambda q: search_relevant_passages(corpus, q, faiss_index, top_k=3), queries, rounds=args.rounds))
+    stages.append(measure('generate_itinerary[fake]', lambda df: generate_itinerary(df, 3, "Mid-Range", "Solo"), [corpus], rounds=args.rounds))
+
+    # Exports on a table of a few hundred videos, bypassing the content-hash cache
+    from Components import export
+    export_df = pd.concat([corpus] * max(1, -(-args.export_rows // len(corpus))), ignore_index=True).head(args.export_rows)
+    itinerary_text = "\n".join(export_df['Summary'].tolist())
+    export_cases = [('csv', export_df), ('jsonl', export_df), ('docx', itinerary_text)]
+    if export.parquet_available():
+        export_cases.append(('parquet', export_df))
+    for fmt, content in export_cases:
+        build = export.BUILDERS[fmt]
+        result = measure(f'export_{fmt}[{args.export_rows} rows]', build, [content], rounds=args.rounds)
+        result['bytes'] = len(build(content))
+        stages.append(result)
+    stages.append(measure('export_cached_csv', lambda df: export.export(df, 'csv'), [export_df], rounds=args.rounds * 10))
+
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'corpus_rows': len(corpus),
+        'fake_models': args.fake_models,
+        'peak_rss_mb': peak_rss_mb(),
+        'stages': stages,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the travel agent pipeline stages.")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help="CSV with Title, Duration, Views, Channel, Link, Transcript and Summary columns.")
+    parser.add_argument('--scale', type=int, default=1, help="Repeat the corpus this many times.")
+    parser.add_argument('--rounds', type=int, default=3, help="Repetitions per stage.")
+    parser.add_argument('--summaries', type=int, default=3, help="Transcripts to summarize (BART is slow).")
+    parser.add_argument('--export-rows', type=int, default=300, help="Rows in the table used for the export benchmarks.")
+    parser.add_argument('--fake-models', action='store_true', help="Use a stand-in summarizer instead of BART.")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Where to write the JSON results.")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON to compare against.")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed p50 slowdown or allocation growth before a stage counts as a regression.")
+    parser.add_argument('--update-baseline', action='store_true', help="Write this run to the baseline file.")
+    args = parser.parse_args()
+
+    results = run(args)
+
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            results['regressions'] = compare_with_baseline(results, json.load(f), args.tolerance)
+    else:
+        results['regressions'] = []
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+    elif not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to create one.")
+
+    for regression in results['regressions']:
+        print(f"REGRESSION {regression['stage']}: {regression['metric']} {regression['baseline']:.3f} -> {regression['value']:.3f} ({regression['ratio']:.2f}x)")
+    return 1 if results['regressions'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# benchmarks/bench_summarization.py
+#
+# Latency / ROUGE tradeoff of the summarization profiles on the bundled CSV corpus.
+# The corpus summaries were produced by facebook/bart-large-cnn with the original settings,
+# so they serve as the reference: "quality" should score close to 1.0 and the question is
+# how much "balanced" and "fast" give up for their speed. Models must already be cached locally.
+#
+# Usage (from the repository root):
+#   python -m benchmarks.bench_summarization
+#   python -m benchmarks.bench_summarization --profiles fast balanced --limit 3
+
+import os
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+import re
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS = os.path.join(BENCH_DIR, "..", "summarized_videos (1).csv")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "summarization_results.json")
+
+def _tokens(text):
+    return re.findall(r"[a-z0-9']+", str(text).lower())
+
+def rouge_n(candidate, reference, n=1):
+    """
+    ROUGE-N F1 between two texts.
+    """
+    def ngrams(tokens):
+        return Counter(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    cand, ref = ngrams(_tokens(candidate)), ngrams(_tokens(reference))
+    overlap = sum((cand & ref).values())
+    if not cand or not ref or not overlap:
+        return 0.0
+    precision, recall = overlap / sum(cand.values()), overlap / sum(ref.values())
+    return 2 * precision * recall / (precision + recall)
+
+def rouge_l(candidate, reference):
+    """
+    ROUGE-L F1 (longest common subsequence) between two texts.
+    """
+    cand, ref = _tokens(candidate), _tokens(reference)
+    if not cand or not ref:
+        return 0.0
+    # Row-by-row LCS dynamic programming
+    previous = [0] * (len(ref) + 1)
+    for c in cand:
+        current = [0]
+        for j, r in enumerate(ref, 1):
+            current.append(previous[j - 1] + 1 if c == r else max(previous[j], current[j - 1]))
+        previous = current
+    lcs = previous[-1]
+    if not lcs:
+        return 0.0
+    precision, recall = lcs / len(cand), lcs / len(ref)
+    return 2 * precision * recall / (precision + recall)
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency / ROUGE tradeoff of the summarization profiles.")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--profiles', nargs='+', default=['fast', 'balanced', 'quality'])
+    parser.add_argument('--limit', type=int, default=None, help="Only summarize the first N valid transcripts.")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    from Components.dedup import is_valid_transcript
+    from Components.summarizer import get_summarizer, summarize_text
+    from Components.constants import SUMMARY_PROFILES
+
+    corpus = pd.read_csv(args.corpus).fillna('')
+    corpus = corpus[corpus['Transcript'].map(is_valid_transcript)].head(args.limit)
+
+    results = []
+    for profile in args.profiles:
+        summarizer_pipeline = get_summarizer(SUMMARY_PROFILES[profile]['model'])
+        summarize_text(corpus['Transcript'].iloc[0], summarizer_pipeline, profile)  # Warm-up
+
+        latencies, scores = [], {'rouge1': [], 'rouge2': [], 'rougeL': []}
+        for transcript, reference in zip(corpus['Transcript'], corpus['Summary']):
+            start = time.perf_counter()
+            summary = summarize_text(transcript, summarizer_pipeline, profile)
+            latencies.append(time.perf_counter() - start)
+            scores['rouge1'].append(rouge_n(summary, reference, 1))
+            scores['rouge2'].append(rouge_n(summary, reference, 2))
+            scores['rougeL'].append(rouge_l(summary, reference))
+
+        result = {
+            'profile': profile,
+            **SUMMARY_PROFILES[profile],
+            'videos': len(latencies),
+            'mean_s': float(np.mean(latencies)),
+            'p95_s': float(np.percentile(latencies, 95)),
+            **{name: float(np.mean(values)) for name, values in scores.items()},
+        }
+        results.append(result)
+        print(f"{profile:<10} {result['mean_s']:>7.2f} s/video  p95 {result['p95_s']:>7.2f} s  "
+              f"ROUGE-1 {result['rouge1']:.3f}  ROUGE-2 {result['rouge2']:.3f}  ROUGE-L {result['rougeL']:.3f}")
+
+    with open(args.output, 'w') as f:
+        json.dump({'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
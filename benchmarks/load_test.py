@@ -0,0 +1,409 @@
+# benchmarks/load_test.py
+#
+# Multi-user load test of the Streamlit app (main.py), driven headlessly with streamlit.testing AppTest.
+# YouTube search, transcripts and Ollama are replaced by the local fakes from bench_pipeline;
+# BART and DPR are faked too unless --real-models is given.
+#
+# AppTest installs a process-global mock runtime for each run and tears it down afterwards, so two
+# runs in one process would break each other. By default every user's journey therefore runs in its
+# own worker process and the journeys really overlap: latencies are latencies under parallel load,
+# and RSS is sampled in every worker and summed. Each worker is a separate app server, though, so
+# st.cache_resource stores (video store, index cache, answer cache) are not shared between users,
+# as with several `streamlit run` replicas. With --serialized, all journeys share one process and
+# its caches instead, and their reruns execute one at a time under RUN_LOCK; each action is then
+# reported as service time plus queue wait.
+#
+# A step only counts as successful if its output is right: no exception or st.error, summaries
+# shown and none of them an error, and a chat reply that is not an error.
+#
+# Usage (from the repository root):
+#   python -m benchmarks.load_test --users 20
+#   python -m benchmarks.load_test --users 50 --ramp 10 --output load_results.json
+#   python -m benchmarks.load_test --users 20 --serialized
+
+import os
+import tempfile
+# In-app stage timings come from the metrics spans; keep their files out of the repository
+os.environ.setdefault("TRAVEL_AGENT_METRICS", "1")
+os.environ.setdefault("TRAVEL_AGENT_METRICS_DIR", tempfile.mkdtemp(prefix="load_test_metrics_"))
+
+import sys
+import json
+import time
+import types
+import hashlib
+import argparse
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_pipeline import (
+    DEFAULT_CORPUS, FakeSummarizer, install_fakes, current_rss_mb,
+)
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "load_results.json")
+APP_PATH = os.path.join(BENCH_DIR, "..", "main.py")
+QUESTIONS = ["What is the best time to visit?", "Is it expensive?", "What should I see first?", "Where should I stay?"]
+RUN_LOCK = threading.Lock()  # --serialized: AppTest runs swap process-global runtime state, so only one may run at a time
+
+# ---------------------------------------------------------------------------
+# Stand-ins for the models
+# ---------------------------------------------------------------------------
+
+class FakeFlatIndex:
+    """
+    Minimal numpy stand-in for faiss.IndexFlatIP.
+    """
+    def __init__(self, d):
+        self.d = d
+        self.vectors = np.zeros((0, d), dtype='float32')
+
+    @property
+    def ntotal(self):
+        return len(self.vectors)
+
+    def add(self, vectors):
+        self.vectors = np.vstack([self.vectors, vectors])
+
+    def search(self, queries, k):
+        scores = queries @ self.vectors.T
+        indices = np.argsort(-scores, axis=1)[:, :k]
+        return np.take_along_axis(scores, indices, axis=1), indices
+
+def _hash_embedding(text, dimension=64):
+    # Deterministic bag-of-words embedding, normalized
+    vector = np.zeros(dimension, dtype='float32')
+    for word in str(text).lower().split():
+        vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % dimension] += 1
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+def install_fake_models():
+    """
+    Replaces Components.DPR with a numpy implementation and BART with FakeSummarizer.
+    Must run before anything imports Components.DPR (which loads the real models at import).
+    """
+    fake_dpr = types.ModuleType('Components.DPR')
+
+    def encode_passage(video_df):
+        return np.vstack([_hash_embedding(t) for t in video_df['Transcript'].tolist()])
+
+    def encode_query(query):
+        return _hash_embedding(query).reshape(1, -1)
+
+    def faiss_vector_store(passage_embeddings):
+        index = FakeFlatIndex(passage_embeddings.shape[1])
+        index.add(passage_embeddings)
+        return index
+
+    def search_relevant_passages(video_df, query, faiss_index, top_k=3, query_embedding=None):
+        if query_embedding is None:
+            query_embedding = encode_query(query)
+        distances, indices = faiss_index.search(query_embedding, top_k)
+        top_k_videos = video_df.iloc[indices[0][:top_k]].copy()
+        top_k_videos['Similarity Score'] = distances[0][:top_k]
+        top_k_videos['Query'] = query
+        return top_k_videos
+
+    fake_dpr.encode_passage = encode_passage
+    fake_dpr.encode_query = encode_query
+    fake_dpr.faiss_vector_store = faiss_vector_store
+    fake_dpr.search_relevant_passages = search_relevant_passages
+    sys.modules['Components.DPR'] = fake_dpr
+
+    import Components.summarizer as summarizer
+    summarizer.get_summarizer = lambda model=None: FakeSummarizer()
+    summarizer.split_text_into_chunks = lambda text, max_tokens=1000, model=None: [
+        ' '.join(text.split()[i:i + max_tokens]) for i in range(0, len(text.split()), max_tokens)
+    ]
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+class RssSampler(threading.Thread):
+    """
+    Samples this process's RSS at a fixed interval. Samples carry the PID and a wall-clock time,
+    so the samples of several worker processes can be summed.
+    """
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        pid = os.getpid()
+        while not self._stop_event.is_set():
+            self.samples.append({'pid': pid, 't': time.time(), 'rss_mb': round(current_rss_mb(), 1)})
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+def total_rss(samples, started_at, interval):
+    """
+    Sums the latest sample of every process in each interval. Returns [{'t', 'rss_mb', 'processes'}].
+    """
+    if not samples:
+        return []
+    latest, timeline = {}, []
+    samples = sorted(samples, key=lambda sample: sample['t'])
+    bucket_end = samples[0]['t'] + interval
+    for sample in samples + [None]:
+        if sample is None or sample['t'] >= bucket_end:
+            timeline.append({'t': round(bucket_end - started_at, 3),
+                             'rss_mb': round(sum(latest.values()), 1), 'processes': len(latest)})
+            if sample is None:
+                break
+            while sample['t'] >= bucket_end:
+                bucket_end += interval
+        latest[sample['pid']] = sample['rss_mb']
+    return timeline
+
+# ---------------------------------------------------------------------------
+# User journey
+# ---------------------------------------------------------------------------
+
+def _by_label(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"Widget not found: {label}")
+
+def check_output(at, action):
+    """
+    Returns why the page after an action is wrong, or None if it is right.
+    """
+    if at.exception:
+        return f"exception: {at.exception[0].message}"
+    if at.error:
+        return f"st.error: {at.error[0].value}"
+    if action == 'generate_summaries':
+        summaries = [m.value.split("Summary: ", 1)[1] for m in at.markdown if "Summary: " in m.value]
+        if not summaries:
+            return "no summaries shown"
+        failed = [summary for summary in summaries if summary.startswith("Error")]
+        if failed:
+            return f"{len(failed)} of {len(summaries)} summaries failed: {failed[0][:120]}"
+    elif action == 'ask_question':
+        history = at.session_state['chat_history'] if 'chat_history' in at.session_state else []
+        if not history:
+            return "no chat reply"
+        if history[-1]['assistant'].startswith("Error"):
+            return f"error reply: {history[-1]['assistant'][:120]}"
+    return None
+
+def user_journey(user, timeout, lock=None):
+    """
+    One user: open the Travel Agent page, fetch, transcribe, summarize, initialize DPR and ask a question.
+    Each rerun holds `lock` if given. Returns a list of (action, service seconds, wait seconds, started at, failure),
+    where failure is None for a step whose output was right.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    timings = []
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    def step(action, fn):
+        requested = time.perf_counter()
+        with lock or nullcontext():
+            started_at = time.time()
+            start = time.perf_counter()
+            try:
+                fn()
+                failure = check_output(at, action)
+            except Exception as e:
+                failure = f"{type(e).__name__}: {e}"
+            service = time.perf_counter() - start
+        timings.append((action, service, start - requested, started_at, failure))
+        return failure is None
+
+    steps = [
+        ('open_home', lambda: at.run()),
+        ('open_travel_agent', lambda: _by_label(at.sidebar.selectbox, "Navigate").set_value("🤖 Travel Agent").run()),
+        ('fetch_videos', lambda: _by_label(at.sidebar.button, "⚙️ Fetch Videos").click().run()),
+        ('extract_transcripts', lambda: _by_label(at.sidebar.button, "🛠️ Extract Transcripts").click().run()),
+        ('generate_summaries', lambda: _by_label(at.sidebar.button, "📊 Generate Summaries").click().run()),
+        ('initialize_dpr', lambda: _by_label(at.sidebar.button, "🔧 Initialize DPR").click().run()),
+        ('ask_question', lambda: (
+            _by_label(at.text_input, "Ask a question about your travel destination:").input(QUESTIONS[user % len(QUESTIONS)]),
+            _by_label(at.button, "🛎️ Send").click().run(),
+        )),
+    ]
+    for action, fn in steps:
+        if not step(action, fn):
+            break  # Later steps depend on this one
+    return timings
+
+def install_worker(corpus, real_models):
+    """
+    Installs the fakes; run once per process before any journey.
+    """
+    if not real_models:
+        install_fake_models()
+    install_fakes(pd.read_csv(corpus).fillna(''))
+
+def run_user_process(user, timeout, delay, rss_interval):
+    """
+    Runs one journey in a worker process. Returns its timings, RSS samples and the process's stage metrics.
+    """
+    from Components import metrics
+
+    time.sleep(delay)
+    sampler = RssSampler(rss_interval)
+    sampler.start()
+    try:
+        timings = user_journey(user, timeout)
+    finally:
+        sampler.stop()
+    return {'pid': os.getpid(), 'timings': timings, 'rss_samples': sampler.samples,
+            'app_stages': metrics.snapshot()['stages']}
+
+def merge_stages(snapshots):
+    """
+    Adds up the stage aggregates of several processes.
+    """
+    merged = {}
+    for stages in snapshots:
+        for stage in stages:
+            key = (stage['stage'], tuple(sorted(stage['labels'].items())))
+            entry = merged.setdefault(key, {'stage': stage['stage'], 'labels': stage['labels'],
+                                            'count': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+            entry['count'] += stage['count']
+            entry['seconds'] += stage['seconds']
+            entry['max_seconds'] = max(entry['max_seconds'], stage['max_seconds'])
+    return list(merged.values())
+
+def summarize(timings, elapsed):
+    by_action = {}
+    for action, service, wait, _, failure in timings:
+        entry = by_action.setdefault(action, {'latencies': [], 'waits': [], 'errors': 0, 'failures': []})
+        entry['latencies'].append(service)
+        entry['waits'].append(wait)
+        if failure is not None:
+            entry['errors'] += 1
+            if len(entry['failures']) < 5:
+                entry['failures'].append(failure)
+
+    actions = {}
+    for action, entry in by_action.items():
+        latencies_ms = np.array(entry['latencies']) * 1000
+        waits_ms = np.array(entry['waits']) * 1000
+        actions[action] = {
+            'count': len(latencies_ms),
+            'errors': entry['errors'],
+            'p50_ms': float(np.percentile(latencies_ms, 50)),
+            'p95_ms': float(np.percentile(latencies_ms, 95)),
+            'p99_ms': float(np.percentile(latencies_ms, 99)),
+            'max_ms': float(latencies_ms.max()),
+            'wait_p50_ms': float(np.percentile(waits_ms, 50)),
+            'wait_p95_ms': float(np.percentile(waits_ms, 95)),
+            'failures': entry['failures'],
+        }
+    return actions, len(timings) / elapsed if elapsed > 0 else None
+
+def run_serialized(args):
+    """
+    All journeys in this process, one rerun at a time. Returns (journeys, rss samples, stage metrics).
+    """
+    from Components import metrics
+
+    install_worker(args.corpus, args.real_models)
+    sampler = RssSampler(args.rss_interval)
+    sampler.start()
+
+    def run_user(user):
+        time.sleep(args.ramp * user / args.users)
+        return user_journey(user, args.timeout, lock=RUN_LOCK)
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.users) as executor:
+            journeys = list(executor.map(run_user, range(args.users)))
+    finally:
+        sampler.stop()
+    return journeys, sampler.samples, metrics.snapshot()['stages']
+
+def run_parallel(args):
+    """
+    One worker process per user, so journeys overlap. Returns (journeys, rss samples, stage metrics).
+    """
+    with ProcessPoolExecutor(max_workers=args.users, initializer=install_worker,
+                             initargs=(args.corpus, args.real_models)) as executor:
+        futures = [executor.submit(run_user_process, user, args.timeout, args.ramp * user / args.users, args.rss_interval)
+                   for user in range(args.users)]
+        results = [future.result() for future in futures]
+
+    # A worker may run more than one journey; its stage metrics are cumulative, so keep its last snapshot
+    stages_by_pid = {}
+    for result in results:
+        previous = stages_by_pid.get(result['pid'], [])
+        if sum(s['count'] for s in result['app_stages']) >= sum(s['count'] for s in previous):
+            stages_by_pid[result['pid']] = result['app_stages']
+    samples = [sample for result in results for sample in result['rss_samples']]
+    return [result['timings'] for result in results], samples, merge_stages(stages_by_pid.values())
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-user load test of the Streamlit app.")
+    parser.add_argument('--users', type=int, default=20, help="Concurrent user journeys, one worker process each.")
+    parser.add_argument('--ramp', type=float, default=0.0, help="Seconds over which users are started.")
+    parser.add_argument('--serialized', action='store_true',
+                        help="Run all journeys in one process with shared caches, one rerun at a time.")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--real-models', action='store_true', help="Use the real BART and DPR models (must be cached locally).")
+    parser.add_argument('--timeout', type=float, default=600, help="Per-rerun timeout in seconds.")
+    parser.add_argument('--rss-interval', type=float, default=0.5, help="Seconds between RSS samples.")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    journeys, rss_samples, app_stages = (run_serialized if args.serialized else run_parallel)(args)
+
+    timings = [t for journey in journeys for t in journey]
+    # From the first step's start to the last step's end, so worker start-up is not counted
+    started_at = min((t[3] for t in timings), default=time.time())
+    elapsed = max((t[3] + t[1] for t in timings), default=started_at) - started_at
+    actions, actions_per_s = summarize(timings, elapsed)
+    completed = sum(1 for journey in journeys if len(journey) == 7 and all(t[4] is None for t in journey))
+    rss_timeline = total_rss(rss_samples, started_at, args.rss_interval)
+    if args.serialized:
+        note = ("Reruns execute one at a time in one process with shared caches; latencies are service times, "
+                "not latencies under parallel load.")
+    else:
+        note = ("Each user runs in its own process, so journeys overlap but caches are not shared between users. "
+                "RSS is the sum over worker processes.")
+    report = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'mode': 'serialized' if args.serialized else 'parallel',
+        'note': note,
+        'users': args.users,
+        'real_models': args.real_models,
+        'seconds': elapsed,
+        'journeys_completed': completed,
+        'journeys_per_s': completed / elapsed if elapsed > 0 else None,
+        'actions_per_s': actions_per_s,
+        'peak_rss_mb': max((s['rss_mb'] for s in rss_timeline), default=None),
+        'actions': actions,
+        'app_stages': app_stages,
+        'rss_samples': rss_timeline,
+    }
+
+    for action, stats in actions.items():
+        print(f"{action:<22} n={stats['count']:<4} errors={stats['errors']:<3} p50 {stats['p50_ms']:>9.1f} ms  "
+              f"p95 {stats['p95_ms']:>9.1f} ms  p99 {stats['p99_ms']:>9.1f} ms  wait p95 {stats['wait_p95_ms']:>9.1f} ms")
+        for failure in stats['failures']:
+            print(f"    {failure}")
+    print(f"\n{completed}/{args.users} journeys completed in {elapsed:.1f}s "
+          f"({report['actions_per_s'] or 0:.2f} actions/s), peak RSS {report['peak_rss_mb']} MB")
+    print(f"Note: {report['note']}")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 0 if completed == args.users else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+# benchmarks/ollama_stub.py
+#
+# Local stub of the Ollama HTTP API (/api/chat, /api/generate) with a fixed generation delay.
+# It counts upstream calls and concurrent generations, which makes the shared LLM gateway
+# (Components/llm.py) checkable without a model: identical in-flight prompts must reach the
+# server once, and generations in flight must never exceed OLLAMA_MAX_CONCURRENCY.
+#
+# Usage (from the repository root):
+#   python -m benchmarks.ollama_stub                      # run the gateway checks against the stub
+#   python -m benchmarks.ollama_stub --serve --port 11434 # serve the stub, e.g. for the app or load test
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubOllamaServer(ThreadingHTTPServer):
+    """
+    Threaded stub server. Every request sleeps `delay` seconds to simulate a generation.
+    """
+    daemon_threads = True
+
+    def __init__(self, port=0, delay=0.2):
+        super().__init__(('127.0.0.1', port), _StubHandler)
+        self.delay = delay
+        self.calls = 0
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def reset(self):
+        with self._lock:
+            self.calls, self.prompts, self.max_in_flight = 0, [], 0
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass  # Keep the check output readable
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+        if self.path == '/api/chat':
+            prompt = body['messages'][-1]['content']
+        elif self.path == '/api/generate':
+            prompt = body.get('prompt', '')
+        else:
+            self.send_error(404)
+            return
+
+        with server._lock:
+            server.calls += 1
+            server.prompts.append(prompt)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+        finally:
+            with server._lock:
+                server.in_flight -= 1
+
+        reply = f"Stub answer to: {prompt[:60]}"
+        response = {
+            'model': body.get('model', 'stub'),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'done': True,
+            'done_reason': 'stop',
+            'total_duration': int(server.delay * 1e9),
+            'load_duration': 0,
+            'prompt_eval_count': len(prompt.split()),
+            'prompt_eval_duration': int(server.delay * 0.2 * 1e9),
+            'eval_count': len(reply.split()),
+            'eval_duration': int(server.delay * 0.8 * 1e9),
+        }
+        if self.path == '/api/chat':
+            response['message'] = {'role': 'assistant', 'content': reply}
+        else:
+            response['response'] = reply if prompt else ''
+
+        payload = json.dumps(response).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+# ---------------------------------------------------------------------------
+# Gateway checks
+# ---------------------------------------------------------------------------
+
+def _run_concurrently(fn, args_list):
+    results = [None] * len(args_list)
+    errors = []
+
+    def worker(i, args):
+        try:
+            results[i] = fn(*args)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i, args)) for i, args in enumerate(args_list)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
+
+def check_gateway(server, llm, max_concurrency, callers=8):
+    """
+    Runs the gateway checks against a started stub server. Returns a list of (check, passed, detail).
+    """
+    checks = []
+
+    # Identical prompts sent at the same time are generated once and shared
+    server.reset()
+    replies = _run_concurrently(llm.chat, [("What is the best time to visit Amsterdam?",)] * callers)
+    checks.append((
+        'identical in-flight prompts coalesced',
+        server.calls == 1 and len(set(replies)) == 1,
+        f"{callers} callers -> {server.calls} upstream call(s)",
+    ))
+
+    # Distinct prompts queue on the semaphore instead of all reaching the server at once
+    server.reset()
+    calls_before = len(llm.get_metrics())
+    _run_concurrently(llm.chat, [(f"Question number {i}?",) for i in range(callers * 2)])
+    checks.append((
+        'generations bounded by OLLAMA_MAX_CONCURRENCY',
+        server.calls == callers * 2 and server.max_in_flight <= max_concurrency,
+        f"{server.calls} calls, at most {server.max_in_flight} in flight (limit {max_concurrency})",
+    ))
+
+    # Every call reports its latency breakdown; queued calls show their wait
+    records = llm.get_metrics()[calls_before:]
+    queued = [r for r in records if r['queue_wait'] >= server.delay * 0.5]
+    checks.append((
+        'latency breakdown recorded',
+        len(records) == callers * 2 and len(queued) > 0 and all(r['generation'] > 0 and r['prefill'] > 0 for r in records),
+        f"{len(records)} records, {len(queued)} waited for a slot",
+    ))
+    return checks
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub Ollama server and checks of the shared LLM gateway.")
+    parser.add_argument('--serve', action='store_true', help="Only serve the stub until interrupted.")
+    parser.add_argument('--port', type=int, default=0, help="Port to listen on (default: any free port).")
+    parser.add_argument('--delay', type=float, default=0.2, help="Seconds each generation takes.")
+    parser.add_argument('--concurrency', type=int, default=2, help="OLLAMA_MAX_CONCURRENCY used for the checks.")
+    args = parser.parse_args()
+
+    server = StubOllamaServer(port=args.port, delay=args.delay)
+    if args.serve:
+        print(f"Stub Ollama server listening on {server.url} (set OLLAMA_HOST to use it)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    server.start()
+    # The gateway reads its configuration at import, so point it at the stub first
+    os.environ['OLLAMA_HOST'] = server.url
+    os.environ['OLLAMA_MAX_CONCURRENCY'] = str(args.concurrency)
+    from Components import llm
+
+    checks = check_gateway(server, llm, args.concurrency)
+    server.shutdown()
+    for name, passed, detail in checks:
+        print(f"{'PASS' if passed else 'FAIL'}  {name}: {detail}")
+    return 0 if all(passed for _, passed, _ in checks) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,64 +1,178 @@
 # streamlit
 
-import ollama  # Ensure Ollama is imported for LLM interactions
+import time
 import warnings
+import threading
 import pandas as pd
 import streamlit as st
 from Components.constants import *
-from Components.youtube_search import fetch_youtube_videos
-from Components.transcript import extract_transcripts
-from Components.summarizer import generate_summaries
-from Components.DPR import encode_passage, faiss_vector_store, search_relevant_passages
-from Components.agent import generate_question
-from Components.itinerary import generate_itinerary, save_itinerary_to_doc  # Ensure this is correctly implemented
+from Components.youtube_search import search_youtube_videos, filter_videos
+from Components.transcript import extract_transcripts, extract_video_id, hash_transcript
+from Components.segments import SEGMENTS, find_passage_offset, timestamped_link
+from Components.dedup import deduplicate_videos
+from Components.summarizer import generate_summaries, refine_summaries_in_background
+from Components.DPR import encode_passage, encode_query, faiss_vector_store
+from Components.shards import ALL_DESTINATIONS, split_destinations, shard_frames, route_query, search_shards
+from Components.index_cache import IndexCache, index_fingerprint
+from Components.video_store import VideoStore
+from Components.response_cache import SemanticResponseCache
+from Components.results_view import render_video_results
+from Components.corpus import has_stage, load_corpus
+from Components import llm, metrics
+from Components.agent import generate_llm_response
+from Components.question_bank import get_questions, get_answer, parse_questions
+from Components.itinerary import generate_itinerary
+from Components.export import export, parquet_available, MIME_TYPES
 
 # Suppress all warnings
 warnings.filterwarnings("ignore")
 
-# Initialize FAISS and DPR only once using Streamlit's caching
+# Shared across sessions; answers are scoped to the fingerprints of the index shards they were generated from
 @st.cache_resource
+def get_response_cache():
+    return SemanticResponseCache()
+
+# Shared across sessions; indexes are keyed by a content fingerprint instead of hashing the whole DataFrame
+@st.cache_resource
+def get_index_cache():
+    return IndexCache(on_evict=get_response_cache().invalidate)
+
+# Load the local model in the background once per process so the first question doesn't pay the cold start
+@st.cache_resource
+def warm_up_llm():
+    threading.Thread(target=llm.warm_up, daemon=True).start()
+    return True
+
+# Raw search results are cached so changing a filter never repeats the YouTube search.
+# fetched_at is the time of the Fetch click: every click searches again, re-filtering reuses that search.
+@st.cache_data(max_entries=256, ttl=SEARCH_CACHE_TTL, show_spinner=False)
+def cached_search(destination, preferences, max_results, fetched_at):
+    return search_youtube_videos(destination, list(preferences), max_results)
+
+# Each destination is searched on its own and tagged, so its videos go to their own index shard
+def search_destinations(destinations, preferences, max_results, fetched_at):
+    frames = [cached_search(destination, preferences, max_results, fetched_at).assign(Destination=destination) for destination in destinations]
+    return pd.concat(frames, ignore_index=True).drop_duplicates('Link').reset_index(drop=True)
+
+# Video records are shared across sessions; each session only keeps its list of video IDs
+@st.cache_resource
+def get_video_store():
+    return VideoStore()
+
+def save_session_videos(videos_df):
+    video_ids = get_video_store().add_videos(videos_df)
+    # Destinations stay in the session: another session may find the same video for a different destination
+    destinations = dict(zip(video_ids, videos_df['Destination'])) if 'Destination' in videos_df.columns else {}
+    # A different set of videos or shards invalidates the session's FAISS index (results map back by row)
+    if video_ids != st.session_state.get('video_ids') or destinations != st.session_state.get('video_destinations'):
+        st.session_state['faiss_initialized'] = False
+    st.session_state['video_ids'] = video_ids
+    st.session_state['video_destinations'] = destinations
+
+# Profiling is one-shot: the sidebar button marks only this session's next profiled request
+def take_profile_request():
+    return st.session_state.pop('profile_next_request', False)
+
+def load_session_videos():
+    """
+    Rebuilds this session's view of the shared video records.
+    """
+    video_ids = st.session_state['video_ids']
+    videos_df = get_video_store().to_dataframe(video_ids)
+    # Records evicted from the shared store drop out of the view, so the session's index no longer lines up
+    if len(videos_df) != len(video_ids):
+        st.session_state['video_ids'] = [extract_video_id(link) or link for link in videos_df.get('Link', [])]
+        st.session_state['faiss_initialized'] = False
+
+    destinations = st.session_state.get('video_destinations')
+    if destinations and not videos_df.empty:
+        videos_df['Destination'] = [destinations.get(extract_video_id(link) or link, ALL_DESTINATIONS) for link in videos_df['Link']]
+    return videos_df
+
+def shard_fingerprints(videos_df):
+    return {destination: index_fingerprint(shard_df) for destination, shard_df in shard_frames(videos_df).items()}
+
+# Initialize FAISS and DPR with one index per destination shard.
+# Shards are cached by content, so adding a destination never rebuilds the others.
 def initialize_dpr(videos_df):
+    """
+    Returns (shard_indexes, shard_fingerprints), both keyed by destination, or (None, None) for no videos.
+    """
     if videos_df.empty:
+        return None, None
+
+    shard_indexes, fingerprints = {}, {}
+    for destination, shard_df in shard_frames(videos_df).items():
+        def build_index(shard_df=shard_df):
+            passage_embeddings = encode_passage(shard_df)
+            return faiss_vector_store(passage_embeddings)
+
+        fingerprints[destination] = index_fingerprint(shard_df)
+        with metrics.span('initialize_shard', destination=destination):
+            shard_indexes[destination] = get_index_cache().get_or_build(fingerprints[destination], build_index)
+    return shard_indexes, fingerprints
+
+def answer_query(user_query, videos_df):
+    """
+    Answers a chat question with DPR retrieval and the LLM. Returns None if the index is not ready.
+    """
+    if not st.session_state.get('faiss_initialized', False):
+        st.error("❗ Please initialize DPR before using the chat.")
+        return None
+
+    # Retrieve relevant passages using DPR
+    shard_indexes = st.session_state.get('shard_indexes')
+    if not shard_indexes:
+        st.error("❌ FAISS Index not available.")
+        return None
+
+    # Every shard must still hold exactly the videos its index was built from
+    fingerprints = st.session_state.get('shard_fingerprints', {})
+    if shard_fingerprints(videos_df) != fingerprints:
+        st.session_state['faiss_initialized'] = False
+        st.error("❗ The videos changed since DPR was initialized. Please initialize DPR again.")
         return None
-    passage_embeddings = encode_passage(videos_df)
-    faiss_index = faiss_vector_store(passage_embeddings)
-    return faiss_index
-
-# Function to generate LLM response
-def generate_llm_response(query, context, LLM = "llama3.2"):
-    prompt = f""" You are a knowledgeable and friendly travel guide assistant, ready to provide insightful recommendations and 
-                 answers based on the information given. Please consider the context carefully and answer 
-                 the question below with detailed and helpful information.
-
-                 ### Context:
-                 {context}
-
-                 ### Question:
-                 {query}
-
-                 ### Instructions for Your Answer:
-                 - Provide a comprehensive response, including tips or suggestions if applicable.
-                 - Use a friendly and conversational tone to engage the user.
-                 - Ensure your answer is clear, concise, and directly addresses the question.
-
-                 ### Answer:
-                 """
-    try:
-        response = ollama.chat(model = LLM, messages=[{'role':'user', 'content': prompt}])
-        return response['message']['content']
-    except Exception as e:
-        return f"Error generating response: {e}"
+    shards = {destination: (shard_df, shard_indexes[destination]) for destination, shard_df in shard_frames(videos_df).items()}
+
+    # Reuse the answer to a near-identical earlier question on the same shards and summaries.
+    # The index only covers transcripts, so the summaries are hashed too: refined summaries get fresh answers.
+    response_cache = get_response_cache()
+    routed = route_query(user_query, list(shards))
+    summaries_hash = hash_transcript("\n".join(videos_df['Summary'].astype(str)))
+    cache_key = tuple(sorted(fingerprints[destination] for destination in routed)) + (summaries_hash,)
+    query_embedding = encode_query(user_query)
+    llm_response, _ = response_cache.lookup(cache_key, query_embedding)
+
+    if llm_response is None:
+        # Only the shards of the destinations the question mentions are searched
+        top_k_videos = search_shards(shards, user_query, top_k=3, query_embedding=query_embedding)
+        # Combine summaries as context
+        context = "\n".join(top_k_videos['Summary'].tolist())
+        # Generate response from LLM
+        llm_response = generate_llm_response(user_query, context)
+        if not llm_response.startswith("Error"):
+            # Link each source video at the moment that best matches the question
+            sources = []
+            for row in top_k_videos.to_dict('records'):
+                seconds = SEGMENTS.timestamp_at(extract_video_id(row['Link']), find_passage_offset(row['Transcript'], user_query))
+                sources.append(f"- [{row['Title']}]({timestamped_link(row['Link'], seconds)})")
+            if sources:
+                llm_response += "\n\n**Sources:**\n" + "\n".join(sources)
+            response_cache.store(cache_key, query_embedding, user_query, llm_response)
+    return llm_response
 
 def main():
     # Set Streamlit page configuration
     st.set_page_config(page_title="✈️ Travel Agent Video Summarizer with Ollama LLM's", layout="wide", page_icon="🌎")
+    warm_up_llm()
     
-    # Initialize session state for chat history, videos_df, faiss, generated_questions, and itinerary
-        # Initialize session state for chat history, videos_df, faiss, generated_questions, and itinerary
+    # Initialize session state for chat history, video_ids, faiss, generated_questions, and itinerary
     if 'chat_history' not in st.session_state:
         st.session_state['chat_history'] = []
-    if 'videos_df' not in st.session_state:
-        st.session_state['videos_df'] = pd.DataFrame()
+    if 'video_ids' not in st.session_state:
+        st.session_state['video_ids'] = []  # IDs into the shared video store
+    if 'video_destinations' not in st.session_state:
+        st.session_state['video_destinations'] = {}  # Video ID -> destination shard, per session
     if 'faiss_initialized' not in st.session_state:
         st.session_state['faiss_initialized'] = False
     if 'generated_questions' not in st.session_state:
@@ -118,6 +232,14 @@ Enhance your travel planning experience with our intelligent video summarizer an
     elif choice == "🤖 Travel Agent":
         st.title("🌎 Travel Agent: Your Video Summary Companion (Ollama LLM's)")
 
+        # Only offered when a profiler is configured; profiles this session's next summary, itinerary or chat request
+        if metrics.profiler_enabled() and st.sidebar.button("🔬 Profile Next Request"):
+            st.session_state['profile_next_request'] = True
+            st.sidebar.info("🔬 The next summary, itinerary or chat request will be profiled.")
+
+        # Rebuild this session's view of the shared video records
+        videos_df = load_session_videos()
+
                 # User Inputs (Still on main page for better UX)
         destination = st.text_input("**✈️ Enter travel destination:**", DESTINATION)
 
@@ -131,6 +253,9 @@ Enhance your travel planning experience with our intelligent video summarizer an
         preferences = st.multiselect("**✅ Select your preferences:**", preferences_list, default=preferences_list)
 
         min_views = st.number_input("**👀 Minimum Views:**", min_value=0, value=MIN_VIEWS, step=1000)
+        min_duration = st.number_input("**⏱️ Minimum Duration (minutes):**", min_value=0, value=5, step=1)
+        sort_options = {"Relevance": None, "Views": 'Views', "Duration": 'DurationMinutes', "Channel": 'Channel'}
+        sort_by = st.selectbox("**🔃 Sort videos by:**", list(sort_options))
         max_results = st.number_input("**🔍 Maximum Results:**", min_value=1, max_value=50, value=MAX_RESULTS, step=1)
 
         budget = st.selectbox("**💵 Select your budget:**", BUDGET_OPTIONS)
@@ -149,97 +274,187 @@ Enhance your travel planning experience with our intelligent video summarizer an
         # Fetch Videos
         if st.sidebar.button("⚙️ Fetch Videos"):
             if destination and preferences:
-                with st.spinner("⚙️ Fetching YouTube videos..."):
-                    videos = fetch_youtube_videos(destination, preferences, min_views, max_results)
-
-                if videos:
-                    st.session_state['videos_df'] = pd.DataFrame(videos)
-                    st.success(f"✅ Found {len(videos)} videos with more than {min_views} views.")
-
-                    st.markdown("### Fetched Videos:")
-                    st.markdown("**Note:** Click on 'Watch Video' to view the video.")
-                    for idx, row in st.session_state['videos_df'].iterrows():
-                        st.markdown(f"**{idx + 1}. {row['Title']}**")
-                        st.markdown(f"Duration: {row['Duration']} | Views: {row['Views']} | Channel: {row['Channel']}")
-                        st.markdown(f"[Watch Video]({row['Link']})")
-                        st.markdown("---")
-                else:
+                with st.spinner("⚙️ Fetching YouTube videos..."), metrics.span('fetch_videos'):
+                    search_params = (tuple(split_destinations(destination)), tuple(preferences), int(max_results), time.time())
+                    raw_df = search_destinations(*search_params)
+                st.session_state['search_params'] = search_params
+                st.session_state['applied_filters'] = None  # Apply the current filters below
+
+                if raw_df.empty:
                     st.warning("⚠️ No videos found with the given criteria.")
             else:
                 st.error("❗ Please enter a destination and select at least one preference.")
 
+        # Filters are applied to the cached search results, so adjusting them needs no new search
+        if st.session_state.get('search_params'):
+            raw_df = search_destinations(*st.session_state['search_params'])
+            channels = st.multiselect("**📺 Only these channels:**", sorted(raw_df['Channel'].dropna().unique()))
+            # Sorting is not a filter: it only reorders the results view, so the session's videos and index stay as they are
+            filters = (int(min_views), int(min_duration), tuple(channels))
+
+            if filters != st.session_state.get('applied_filters'):
+                filtered_df = filter_videos(raw_df, min_views, min_duration, channels=channels)
+                st.session_state['applied_filters'] = filters
+                save_session_videos(filtered_df)
+                # Picks up transcripts and summaries already stored for these videos
+                videos_df = load_session_videos()
+                if not filtered_df.empty:
+                    st.success(f"✅ Found {len(filtered_df)} of {len(raw_df)} videos with more than {min_views} views.")
+                elif not raw_df.empty:
+                    st.warning("⚠️ No videos match the current filters.")
+
+        # Load corpora precomputed offline with batch.py (one shard per destination), skipping every pipeline stage
+        precomputed = [d for d in split_destinations(destination) if has_stage(d, 'index')]
+        if precomputed:
+            if st.sidebar.button("📦 Load Precomputed Corpus"):
+                with st.spinner("📦 Loading precomputed corpus..."), metrics.span('load_corpus'):
+                    frames = []
+                    for shard_destination in precomputed:
+                        corpus_df, faiss_index = load_corpus(shard_destination)
+                        if corpus_df is None:
+                            continue
+                        corpus_df['Destination'] = shard_destination
+                        get_index_cache().put(index_fingerprint(corpus_df), faiss_index)
+                        frames.append(corpus_df)
+                    if frames:
+                        videos_df = pd.concat(frames, ignore_index=True).drop_duplicates('Link').reset_index(drop=True)
+                        save_session_videos(videos_df)
+                        # Served from the index cache unless a shard lost a video shared with another shard
+                        shard_indexes, fingerprints = initialize_dpr(videos_df)
+                if frames:
+                    st.session_state['search_params'] = None  # Filters no longer apply to the loaded corpus
+                    st.session_state['faiss_initialized'] = True
+                    st.session_state['shard_indexes'] = shard_indexes
+                    st.session_state['shard_fingerprints'] = fingerprints
+                    st.success(f"✅ Loaded {len(videos_df)} summarized videos for {', '.join(precomputed)}. DPR is ready for chat.")
+                else:
+                    st.error("❌ The precomputed corpus is incomplete.")
+
         # Extract Transcripts
-        if not st.session_state.get('videos_df', pd.DataFrame()).empty:
+        if not videos_df.empty:
             if st.sidebar.button("🛠️ Extract Transcripts"):
-                with st.spinner("🛠️ Extracting transcripts..."):
-                    st.session_state['videos_df'] = extract_transcripts(st.session_state['videos_df'])
+                with st.spinner("🛠️ Extracting transcripts..."), metrics.span('extract_transcripts'):
+                    videos_df = extract_transcripts(videos_df)
+                    # Collapse re-uploads and overlapping videos before any summarization or encoding
+                    videos_df, dedup_report = deduplicate_videos(videos_df)
+                    save_session_videos(videos_df)
                 st.success("✅ Transcripts extracted.")
-
-                st.markdown("### Videos with Transcripts:")
-                for idx, row in st.session_state['videos_df'].iterrows():
-                    st.markdown(f"**{idx + 1}. {row['Title']}**")
-                    st.markdown(f"Transcript: {row['Transcript']}")
-                    st.markdown("---")
+                if dedup_report['videos_dropped']:
+                    st.info(
+                        f"♻️ Skipped {dedup_report['videos_dropped']} near-duplicate videos "
+                        f"(~{dedup_report['bart_chunks_skipped']} BART chunks and {dedup_report['dpr_passages_skipped']} DPR passages saved)."
+                    )
 
         # Generate Summaries
-        if not st.session_state['videos_df'].empty and 'Transcript' in st.session_state['videos_df'].columns:
+        if not videos_df.empty and 'Transcript' in videos_df.columns:
+            summary_modes = {
+                "Quality": ("quality", False),
+                "Balanced": ("balanced", False),
+                "Fast": ("fast", False),
+                "Fast, then refine in background": ("fast", True),
+            }
+            summary_mode = st.sidebar.selectbox("📊 Summary profile", list(summary_modes))
             if st.sidebar.button("📊 Generate Summaries"):
-                with st.spinner("📊 Generating summaries..."):
+                profile, refine = summary_modes[summary_mode]
+                with st.spinner("📊 Generating summaries..."), metrics.profile('summaries', requested=take_profile_request()), metrics.span('generate_summaries', profile=profile):
                     # Initialize a progress bar
                     progress_bar = st.progress(0)
 
                     # Generate summaries for all videos
-                    st.session_state['videos_df'] = generate_summaries(st.session_state['videos_df'])
+                    videos_df = generate_summaries(videos_df, profile)
+                    save_session_videos(videos_df)
+                    # Shows what the store kept: a better summary another session already made is not replaced
+                    videos_df = load_session_videos()
 
                     # Update the progress bar to 100%
                     progress_bar.progress(1.0)
                 st.success("✅ Summaries generated.")
 
-                st.markdown("### Videos with Summaries:")
-                for idx, row in st.session_state['videos_df'].iterrows():
-                    st.markdown(f"**{idx + 1}. {row['Title']}**")
-                    st.markdown(f"Summary: {row['Summary']}")
-                    st.markdown("---")
+                # Quality summaries replace the fast ones in the shared store as soon as they are ready;
+                # other sessions showing these videos only ever see their summaries upgraded
+                if refine:
+                    refine_summaries_in_background(videos_df, on_done=get_video_store().add_videos)
+                    st.session_state['refining_summaries'] = True
+
+        if st.session_state.get('refining_summaries') and 'SummaryProfile' in videos_df.columns:
+            if (videos_df['SummaryProfile'] == 'fast').any():
+                st.info("⏳ Showing fast summaries; quality summaries are being generated in the background and appear on the next refresh.")
+            else:
+                st.session_state['refining_summaries'] = False
+
+        # Paginated results view, kept on screen across reruns
+        if not videos_df.empty:
+            st.markdown("### Videos:")
+            st.markdown("**Note:** Click on 'Watch Video' to view the video.")
+            sort_column = sort_options[sort_by]
+            if sort_column in videos_df.columns:
+                render_video_results(videos_df.sort_values(sort_column, ascending=False, kind='stable'))
+            else:
+                render_video_results(videos_df)
 
         # Initialize DPR
-        if not st.session_state['videos_df'].empty and 'Summary' in st.session_state['videos_df'].columns:
+        if not videos_df.empty and 'Summary' in videos_df.columns:
             if st.sidebar.button("🔧 Initialize DPR"):
-                with st.spinner("🔧 Encoding passages and initializing DPR..."):
-                    faiss_index = initialize_dpr(st.session_state['videos_df'])
-                if faiss_index is not None:
+                with st.spinner("🔧 Encoding passages and initializing DPR..."), metrics.span('initialize_dpr'):
+                    shard_indexes, fingerprints = initialize_dpr(videos_df)
+                if shard_indexes:
                     st.session_state['faiss_initialized'] = True
-                    st.session_state['faiss_index'] = faiss_index  # Store FAISS index in session state
+                    st.session_state['shard_indexes'] = shard_indexes  # Store the FAISS shards in session state
+                    st.session_state['shard_fingerprints'] = fingerprints
                     st.success("✅ DPR initialized.")
                     st.write("FAISS Index has been initialized and is ready for chat.")
                 else:
                     st.error("❌ Failed to initialize DPR. DataFrame is empty or invalid.")
 
         # Generate Travel Questions using Agent
-        if not st.session_state['videos_df'].empty and 'Summary' in st.session_state['videos_df'].columns:
+        if not videos_df.empty and 'Summary' in videos_df.columns:
             if st.sidebar.button("💡 Generate Travel Questions"):
                 with st.spinner("💡 Generating questions..."):
-                    questions = generate_question(destination)
-                st.session_state['generated_questions'].append(questions)  # Append to the list
+                    # The bank is keyed by single destinations, so each one gets its own question set
+                    for city in split_destinations(destination):
+                        questions = get_questions(city)  # Served from the question bank when available
+                        st.session_state['generated_questions'].append({'city': city, 'questions': questions})
                 st.success("✅ Questions generated.")
 
         # Display Stored Generated Questions Persistently
         if st.session_state['generated_questions']:
             st.markdown(f"### Top 10 Questions for First-Time Travelers to {destination}:")
             for idx, question_set in enumerate(st.session_state['generated_questions'], 1):
-                st.markdown(f"**Set {idx}:**")
-                st.markdown(question_set)
+                st.markdown(f"**Set {idx} ({question_set['city']}):**")
+                parsed_questions = parse_questions(question_set['questions'])
+                if not parsed_questions:
+                    st.markdown(question_set['questions'])
+                # Clicking a question asks it in the chat; pre-answered bank questions return immediately
+                for number, question in enumerate(parsed_questions, 1):
+                    if st.button(f"{number}. {question}", key=f"question_{idx}_{number}"):
+                        answer = get_answer(question_set['city'], question)
+                        if answer is None:
+                            with st.spinner("🛎️ Generating response..."):
+                                answer = answer_query(question, videos_df)
+                        if answer is not None:
+                            st.session_state['chat_history'].append({"user": question, "assistant": answer})
             st.markdown("---")  # Separator for clarity
 
         # Generate Itinerary
-        if not st.session_state['videos_df'].empty and 'Summary' in st.session_state['videos_df'].columns:
+        if not videos_df.empty and 'Summary' in videos_df.columns:
             if st.sidebar.button("🗓️ Generate Itinerary"):
-                with st.spinner("🗓️ Generating itinerary..."):
+                with st.spinner("🗓️ Generating itinerary..."), metrics.profile('itinerary', requested=take_profile_request()), metrics.span('generate_itinerary'):
+                    # Stream each day to the page as soon as its generation finishes
+                    partial_itinerary = st.empty()
+                    completed_days = {}
+
+                    def show_day(day, plan):
+                        completed_days[day] = plan
+                        partial_itinerary.markdown("\n\n".join(completed_days[d] for d in sorted(completed_days)))
+
                     itinerary = generate_itinerary(
-                        st.session_state['videos_df'],
+                        videos_df,
                         duration=int(duration),
                         budget=budget,
-                        travel_style=travel_style
+                        travel_style=travel_style,
+                        on_day=show_day
                     )
+                    partial_itinerary.empty()
                 st.session_state['itinerary'].append(itinerary)  # Append to the list
                 st.success("✅ Itinerary generated.")
 
@@ -259,66 +474,52 @@ Enhance your travel planning experience with our intelligent video summarizer an
                 file_name='itinerary.txt',
                 mime='text/plain'
             )
-            # Download as DOCX
+            # Download as DOCX, built in memory so concurrent users never share a file
             if st.button("📥 Download Itinerary as DOCX"):
-                save_itinerary_to_doc(itinerary_text)  # Save to a DOCX file
-                with open('itinerary.docx', 'rb') as doc_file:
-                    st.download_button(
-                        "📥 Click here to download the DOCX itinerary",
-                        data=doc_file,
-                        file_name='itinerary.docx',
-                        mime='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-                    )
+                st.download_button(
+                    "📥 Click here to download the DOCX itinerary",
+                    data=export(itinerary_text, 'docx'),
+                    file_name='itinerary.docx',
+                    mime=MIME_TYPES['docx']
+                )
 
         # Chat Interface
-        if not st.session_state['videos_df'].empty and 'Summary' in st.session_state['videos_df'].columns:
+        if not videos_df.empty and 'Summary' in videos_df.columns:
             st.header("💬 Chat with Travel Guide Assistant")
 
             # Input for user query
             user_query = st.text_input("Ask a question about your travel destination:")
 
             if st.button("🛎️ Send") and user_query:
-                if not st.session_state.get('faiss_initialized', False):
-                    st.error("❗ Please initialize DPR before using the chat.")
-                else:
-                    with st.spinner("🛎️ Generating response..."):
-                        # Retrieve relevant passages using DPR
-                        faiss_index = st.session_state.get('faiss_index', None)
-                        if faiss_index is None:
-                            st.error("❌ FAISS Index not available.")
-                            return
-                        top_k_videos = search_relevant_passages(
-                            st.session_state['videos_df'], user_query, faiss_index, top_k=3
-                        )
-                        # Combine summaries as context
-                        context = "\n".join(top_k_videos['Summary'].tolist())
-                        # Generate response from LLM
-                        llm_response = generate_llm_response(user_query, context)
-
-                # Initialize chat history if not already done
-                if 'chat_history' not in st.session_state:
-                    st.session_state['chat_history'] = []
+                with st.spinner("🛎️ Generating response..."), metrics.profile('chat', requested=take_profile_request()), metrics.span('chat_request'):
+                    llm_response = answer_query(user_query, videos_df)
 
                 # Update chat history
-                st.session_state['chat_history'].append({"user": user_query, "assistant": llm_response})
+                if llm_response is not None:
+                    st.session_state['chat_history'].append({"user": user_query, "assistant": llm_response})
 
         # Display chat history
         if st.session_state.get('chat_history'):
             st.markdown("### Conversation:")
+            cache_stats = get_response_cache().stats()
+            st.caption(f"Answer cache hit rate: {cache_stats['hit_rate']:.0%} ({cache_stats['hits']} of {cache_stats['hits'] + cache_stats['misses']} questions)")
             for chat in st.session_state['chat_history']:
                 st.markdown(f"**You:** {chat['user']}")
                 st.markdown(f"**Assistant:** {chat['assistant']}")
                 st.markdown("---")
 
         # Option to download the results
-        if not st.session_state['videos_df'].empty:
-            csv = st.session_state['videos_df'].to_csv(index=False)
-            st.download_button(
-                "📥 Download Results as CSV",
-                data=csv,
-                file_name='summarized_videos.csv',
-                mime='text/csv'
-            )
+        # The export is only built when requested and is cached by content, not rebuilt on every rerun
+        if not videos_df.empty:
+            export_formats = ['csv', 'jsonl'] + (['parquet'] if parquet_available() else [])
+            export_format = st.selectbox("**📁 Results format:**", export_formats)
+            if st.button("📥 Prepare Results"):
+                st.download_button(
+                    f"📥 Click here to download the {export_format.upper()} results",
+                    data=export(videos_df, export_format),
+                    file_name=f'summarized_videos.{export_format}',
+                    mime=MIME_TYPES[export_format]
+                )
 
     # Contact Page
     elif choice == "📧 Contact":
@@ -337,5 +538,8 @@ Enhance your travel planning experience with our intelligent video summarizer an
     st.markdown("---")
     st.markdown("© 2024 Travel Guide Video Summarizer by Pavan Kumar CH. All rights reserved. 🛡️")
 
+    # Refresh the Prometheus text file once per rerun (no-op when metrics are disabled)
+    metrics.export_prometheus()
+
 if __name__ == "__main__":
     main()